@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import logging
 from pathlib import Path
 from decouple import config
 
@@ -154,7 +155,72 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "notebooks.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Opt-in: lists stay plain arrays unless ?cursor= or ?page_size= is sent
+    "DEFAULT_PAGINATION_CLASS": "notebooks.pagination.OptInCursorPagination",
+    "PAGE_SIZE": 50,
 }
+
+# Worker threads for background package generation (?async=1)
+NOTEBOOK_TASK_WORKERS = config("NOTEBOOK_TASK_WORKERS", default=2, cast=int)
+
+# Warm R processes reused across renders (0 = start R for every render)
+R_WORKER_POOL_SIZE = config("R_WORKER_POOL_SIZE", default=0, cast=int)
+
+# Persistent R library packages are installed into, shared by every render
+R_LIBS_CACHE_DIR = config(
+    "R_LIBS_CACHE_DIR", default=str(BASE_DIR / "storage" / "rlib")
+)
+
+# Entries kept in each content-addressed cache, renders and diffs (0 = disabled)
+RENDER_CACHE_SIZE = config("RENDER_CACHE_SIZE", default=20, cast=int)
+# Under storage/ next to the notebooks, so files can be hard linked between them
+RENDER_CACHE_DIR = config(
+    "RENDER_CACHE_DIR", default=str(BASE_DIR / "storage" / "cache")
+)
+DIFF_CACHE_DIR = config(
+    "DIFF_CACHE_DIR", default=str(BASE_DIR / "storage" / "diff_cache")
+)
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "executor": {
+            "format": "[%(asctime)s] [%(levelname)s] [%(executor)s] %(message)s",
+            "datefmt": "%H:%M:%S",
+        },
+    },
+    "handlers": {
+        "executor_console": {
+            "class": "logging.StreamHandler",
+            "stream": "ext://sys.stdout",
+            "formatter": "executor",
+        },
+        # Batches executor records so stdout is written (and flushed) once per
+        # batch; errors and shutdown flush immediately. 0 writes every record.
+        "executor_buffer": {
+            "class": "logging.handlers.MemoryHandler",
+            "capacity": config("EXECUTOR_LOG_BUFFER", default=1024, cast=int),
+            "flushLevel": logging.ERROR,
+            "target": "executor_console",
+        },
+    },
+    "loggers": {
+        "notebooks.executors": {
+            "handlers": ["executor_buffer"],
+            "level": config("EXECUTOR_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "R Notebook Platform API",
     "DESCRIPTION": "API for managing R notebooks with reproducibility analysis",
@@ -1,13 +1,14 @@
 # backend/notebook_api/urls.py
+import functools
+
 from django.contrib import admin
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from django.urls import path, include, reverse
+from rest_framework.response import Response
+from rest_framework.routers import SimpleRouter
+from rest_framework.urlpatterns import format_suffix_patterns
+from rest_framework.views import APIView
+from django.utils.module_loading import import_string
 from rest_framework.authtoken.views import obtain_auth_token
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
 
 from notebooks.views import (
     NotebookViewSet,
@@ -20,24 +21,79 @@ from notebooks.views import (
     UserRegisterView,
 )
 
-router = DefaultRouter()
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    Import a class-based view on its first request instead of at URLconf load.
+
+    Keeps the OpenAPI schema machinery out of worker start-up for processes
+    that never serve the API docs.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+router = SimpleRouter()
 router.register(r"notebooks", NotebookViewSet, basename="notebook")
 router.register(r"users", UserViewSet, basename="user")
 router.register(r"analyses", ReproducibilityAnalysisViewSet, basename="analysis")
 
+
+@functools.lru_cache(maxsize=1)
+def api_root_urls():
+    """
+    Top-level API endpoints, reversed once on first use.
+
+    Reversing needs the loaded URLconf, so this cannot run at import.
+    """
+    return {
+        prefix: reverse(f"{basename}-list") for prefix, _, basename in router.registry
+    }
+
+
+class APIRootView(APIView):
+    """
+    List the top-level API endpoints.
+
+    Replaces DefaultRouter's root view, which reverses every route on each
+    request; permissions and renderers are the API defaults.
+    """
+
+    schema = None  # Not part of the documented API
+
+    def get(self, request, *args, **kwargs):
+        return Response(api_root_urls())
+
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/login/", UserLoginView.as_view(), name="api-token-auth"),
     path("api/auth/register/", UserRegisterView.as_view(), name="user-register"),
+    *format_suffix_patterns([path("api/", APIRootView.as_view(), name="api-root")]),
     path("api/", include(router.urls)),
     path("api-auth/", include("rest_framework.urls")),
     path("api/auth/profile/", UserProfileView.as_view(), name="user-profile"),
     path("api/auth/logout/", UserLogoutView.as_view(), name="logout"),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path(
+        "api/schema/",
+        lazy_view("drf_spectacular.views.SpectacularAPIView"),
+        name="schema",
+    ),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
         name="swagger-ui",
     ),
-    path("api/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"),
+    path(
+        "api/redoc/",
+        lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
+        name="redoc",
+    ),
 ]
@@ -7,29 +7,80 @@ from django.contrib import admin
 from .models import Notebook, Execution, ReproducibilityAnalysis
 
 
+def _is_changelist(request) -> bool:
+    """Return True when the request targets an admin changelist page."""
+    match = getattr(request, "resolver_match", None)
+    return bool(match and match.url_name and match.url_name.endswith("_changelist"))
+
+
 @admin.register(Notebook)
 class NotebookAdmin(admin.ModelAdmin):
     """Admin interface for Notebook model."""
 
-    list_display = ["title", "author", "created_at", "updated_at", "is_public"]
+    list_display = ["title", "author_username", "created_at", "updated_at", "is_public"]
     list_filter = ["is_public", "created_at"]
     search_fields = ["title", "author__username"]
     readonly_fields = ["created_at", "updated_at"]
 
+    def get_queryset(self, request):
+        # Join author once instead of one query per row
+        qs = super().get_queryset(request).select_related("author")
+        if _is_changelist(request):
+            # List view never renders the R Markdown source
+            qs = qs.defer("content")
+        return qs
+
+    def get_search_results(self, request, queryset, search_term):
+        # No term means no filter, so skip building the OR/JOIN lookup
+        if not search_term:
+            return queryset, False
+        return super().get_search_results(request, queryset, search_term)
+
+    @admin.display(description="Author", ordering="author__username")
+    def author_username(self, obj):
+        return obj.author.username
+
+
+class BaseNotebookRelatedAdmin(admin.ModelAdmin):
+    """
+    Shared admin config for models hanging off a Notebook.
+
+    Subclasses list their changelist columns in ``changelist_only``; the
+    notebook title and author username are always loaded alongside them.
+    """
+
+    changelist_only = ("id",)
+
+    def get_queryset(self, request):
+        # Notebook.__str__ reads author.username, so join both levels
+        qs = super().get_queryset(request).select_related(
+            "notebook", "notebook__author"
+        )
+        if _is_changelist(request):
+            # Skip large HTML/error columns on the list view
+            qs = qs.only(
+                *self.changelist_only,
+                "notebook__title",
+                "notebook__author__username",
+            )
+        return qs
+
 
 @admin.register(Execution)
-class ExecutionAdmin(admin.ModelAdmin):
+class ExecutionAdmin(BaseNotebookRelatedAdmin):
     """Admin interface for Execution model."""
 
     list_display = ["notebook", "status", "started_at", "completed_at"]
     list_filter = ["status", "started_at"]
     readonly_fields = ["started_at", "completed_at"]
+    changelist_only = ("id", "status", "started_at", "completed_at")
 
 
 @admin.register(ReproducibilityAnalysis)
-class ReproducibilityAnalysisAdmin(admin.ModelAdmin):
+class ReproducibilityAnalysisAdmin(BaseNotebookRelatedAdmin):
     """Admin interface for ReproducibilityAnalysis model."""
 
     list_display = ["notebook", "created_at"]
     list_filter = ["created_at"]
     readonly_fields = ["created_at", "updated_at"]
+    changelist_only = ("id", "created_at")
@@ -3,11 +3,151 @@ Base executor class providing common utilities for all notebook executors.
 Includes command execution, logging, and error handling functionality.
 """
 
+import contextlib
+import logging
+import os
+import selectors
+import shutil
 import subprocess
-import datetime
-from typing import Optional, Dict, Any
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, Dict, Any, Tuple
 from abc import ABC, abstractmethod
 
+logger = logging.getLogger("notebooks.executors")
+
+# Read size for draining child process pipes
+_PIPE_CHUNK_SIZE = 64 * 1024
+
+# Output lines returned to clients when the full log is written to disk
+LOG_TAIL_LINES = 1000
+
+
+def _resolve_scratch_dir() -> str:
+    """
+    Pick the parent directory for executor working directories.
+
+    Prefers a RAM-backed tmpfs location (``/dev/shm`` on Linux) so the many
+    short-lived files written during rendering never hit disk. Falls back to
+    the system temp directory when it is unavailable or not writable.
+    """
+    candidate = os.environ.get("EXECUTOR_SCRATCH_DIR", "/dev/shm/r4r")
+    try:
+        os.makedirs(candidate, exist_ok=True)
+        if os.access(candidate, os.W_OK | os.X_OK):
+            return candidate
+    except OSError:
+        pass
+    return tempfile.gettempdir()
+
+
+SCRATCH_DIR = _resolve_scratch_dir()
+
+# Working directories are deleted off the request thread
+_cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scratch-rm")
+
+
+@contextlib.contextmanager
+def scratch_dir(min_free_bytes: int = 0):
+    """
+    Create a temporary working directory and remove it in the background.
+
+    Directories are created under SCRATCH_DIR unless it has less than
+    ``min_free_bytes`` free, in which case the disk-backed system temp
+    directory is used. Deleting large trees (r4r traces) can take a while,
+    so the removal is queued on a background thread instead of blocking
+    the caller.
+
+    Yields:
+        Path to the new directory
+    """
+    parent = SCRATCH_DIR
+    if min_free_bytes:
+        try:
+            if shutil.disk_usage(parent).free < min_free_bytes:
+                parent = tempfile.gettempdir()
+        except OSError:
+            parent = tempfile.gettempdir()
+
+    path = tempfile.mkdtemp(dir=parent)
+    try:
+        yield path
+    finally:
+        _cleanup_pool.submit(shutil.rmtree, path, ignore_errors=True)
+
+
+class _TailBuffer:
+    """Keeps only the last ``max_lines`` lines written to a stream."""
+
+    def __init__(self, max_lines: int):
+        self.lines = deque(maxlen=max_lines)
+        self.partial = b""
+
+    def feed(self, chunk: bytes):
+        """Append raw bytes, splitting complete lines into the ring buffer."""
+        data = self.partial + chunk
+        head, sep, self.partial = data.rpartition(b"\n")
+        if sep:
+            self.lines.extend((head + sep).splitlines(keepends=True))
+
+    def text(self) -> str:
+        """Decode the retained tail (including any unterminated last line)."""
+        if self.partial:
+            self.lines.append(self.partial)
+            self.partial = b""
+        return b"".join(self.lines).decode("utf-8", errors="replace")
+
+
+def _drain_process(
+    proc: subprocess.Popen,
+    timeout: float,
+    max_lines: int,
+    log_file: Optional[BinaryIO] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read stdout/stderr of a running process until it exits or times out.
+
+    Both pipes are multiplexed with a selector so neither can fill up and
+    deadlock the child, and only the last ``max_lines`` lines of each are kept.
+    When ``log_file`` is given, the complete interleaved output is written
+    to it as it arrives.
+
+    Returns:
+        Tuple of (stdout, stderr) tails, or (None, None) if the deadline passed.
+    """
+    deadline = time.monotonic() + timeout
+    buffers = {
+        proc.stdout: _TailBuffer(max_lines),
+        proc.stderr: _TailBuffer(max_lines),
+    }
+
+    with selectors.DefaultSelector() as sel:
+        for pipe in buffers:
+            sel.register(pipe, selectors.EVENT_READ)
+
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, None
+            for key, _ in sel.select(timeout=remaining):
+                chunk = os.read(key.fileobj.fileno(), _PIPE_CHUNK_SIZE)
+                if chunk:
+                    buffers[key.fileobj].feed(chunk)
+                    if log_file is not None:
+                        log_file.write(chunk)
+                else:
+                    sel.unregister(key.fileobj)
+
+    remaining = max(deadline - time.monotonic(), 0)
+    try:
+        proc.wait(timeout=remaining)
+    except subprocess.TimeoutExpired:
+        return None, None
+
+    return buffers[proc.stdout].text(), buffers[proc.stderr].text()
+
 
 class BaseExecutor(ABC):
     """
@@ -25,57 +165,91 @@ class BaseExecutor(ABC):
         desc: str = "Command",
         env: Optional[Dict[str, str]] = None,
         timeout: int = 900,
+        max_output_lines: int = 10000,
+        log_path: Optional[str] = None,
     ) -> subprocess.CompletedProcess:
         """
         Execute a shell command with logging and error handling.
 
+        Output is streamed from the child's pipes into bounded buffers, so
+        memory use stays flat for long, verbose commands such as r4r traces.
+
         Args:
             cmd: Command and arguments as list
             cwd: Working directory for command execution
             desc: Description for logging
             env: Environment variables
             timeout: Command timeout in seconds
+            max_output_lines: Number of trailing stdout/stderr lines to keep
+            log_path: File that receives the full, untruncated output
 
         Returns:
             CompletedProcess object with stdout, stderr, and returncode
         """
-        self._log(f"[{desc}] Running...")
+        self._log("[%s] Running...", desc)
 
         try:
-            result = subprocess.run(
-                cmd, cwd=cwd, capture_output=True, text=True, env=env, timeout=timeout
+            with contextlib.ExitStack() as stack:
+                log_file = None
+                if log_path:
+                    log_file = stack.enter_context(open(log_path, "wb"))
+                proc = stack.enter_context(
+                    subprocess.Popen(
+                        cmd,
+                        cwd=cwd,
+                        env=env,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                    )
+                )
+                stdout, stderr = _drain_process(
+                    proc, timeout, max_output_lines, log_file
+                )
+                if stdout is None:
+                    proc.kill()
+                    proc.wait()
+                    self._log("[%s] TIMEOUT", desc, level="ERROR")
+                    return subprocess.CompletedProcess(
+                        args=cmd, returncode=124, stdout="", stderr="Timeout"
+                    )
+
+            result = subprocess.CompletedProcess(
+                args=cmd, returncode=proc.returncode, stdout=stdout, stderr=stderr
             )
 
             if result.returncode != 0:
-                self._log(f"[{desc}] Failed (Exit: {result.returncode})", level="ERROR")
+                self._log(
+                    "[%s] Failed (Exit: %s)", desc, result.returncode, level="ERROR"
+                )
             else:
-                self._log(f"[{desc}] Success")
+                self._log("[%s] Success", desc)
 
             return result
 
-        except subprocess.TimeoutExpired:
-            self._log(f"[{desc}] TIMEOUT", level="ERROR")
-            return subprocess.CompletedProcess(
-                args=cmd, returncode=124, stdout="", stderr="Timeout"
-            )
         except Exception as e:
-            self._log(f"[{desc}] Exception: {e}", level="ERROR")
+            self._log("[%s] Exception: %s", desc, e, level="ERROR")
             return subprocess.CompletedProcess(
                 args=cmd, returncode=1, stdout="", stderr=str(e)
             )
 
-    def _log(self, msg: str, level: str = "INFO"):
-        """Log message with timestamp and logger name."""
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [{level}] [{self.logger_name}] {msg}", flush=True)
+    def _log(self, msg: str, *args, level: str = "INFO"):
+        """
+        Log message tagged with the executor name.
+
+        Formatting of ``msg % args`` is deferred to the logging framework and
+        skipped entirely when the level is disabled.
+        """
+        levelno = getattr(logging, level, logging.INFO)
+        if logger.isEnabledFor(levelno):
+            logger.log(levelno, msg, *args, extra={"executor": self.logger_name})
 
     def _log_header(self, msg: str):
         """Log major section header."""
-        print(f"\n== {msg} ==", flush=True)
+        self._log("== %s ==", msg)
 
     def _log_section(self, msg: str):
         """Log minor section header."""
-        print(f"\n--- {msg} ---", flush=True)
+        self._log("--- %s ---", msg)
 
     def _error_response(
         self,
@@ -2,17 +2,190 @@
 R4R Executor for generating reproducibility packages.
 """
 
+import json
 import os
-import re
-import tarfile
-import tempfile
+import platform
 import shutil
+import tarfile
 import time
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 
-from .base import BaseExecutor
+from .base import BaseExecutor, LOG_TAIL_LINES, scratch_dir
+from .rmd_executor import _splice_prose
+from ..services.package_manager import r_environment
+from ..services.render_cache import code_key, render_key
 from ..services.storage_manager import StorageManager
 
+try:
+    # Linear-time engine when available (pip install google-re2)
+    import re2 as re
+except ImportError:
+    import re
+
+# Patterns used when parsing r4r output artifacts
+_RE_INSTALL_VERSION = re.compile(
+    r"remotes::install_version\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]"
+)
+
+# r4r install locations, resolved once at import
+_R4R_BINARY = next(
+    (p for p in ("/usr/local/bin/r4r", "/usr/bin/r4r") if os.path.exists(p)), None
+)
+
+# Content hash of the packaged notebook.Rmd, then the file's stat stamp
+_CONTENT_HASH_FILE = ".content_hash"
+# Result of the last successful run, reused while the source is unchanged.
+# Kept beside the artifacts (hidden, so not zipped) so every worker sees it
+_RESULT_FILE = ".r4r_result.json"
+# Sidecar fields that are bookkeeping, not part of the returned result
+_RESULT_PRIVATE_KEYS = ("content_hash", "container_html")
+# Traced source and its knitr intermediates, kept outside the packaged
+# directory for re-rendering prose-only edits
+_RENDER_DIR = "r4r_render"
+
+# Traces can be large; below this much free tmpfs space, work on disk instead
+_R4R_MIN_SCRATCH_BYTES = 1024**3
+_R4R_ENV_OVERRIDES = {
+    "HOME": "/home/r4r",
+    "VISUAL": "/bin/true",  # Prevent interactive prompts
+}
+
+# Dockerfile tokens that are never system library names
+_APT_IGNORE = frozenset(
+    [
+        "RUN",
+        "apt-get",
+        "install",
+        "update",
+        "upgrade",
+        "&&",
+        "\\",
+        "sudo",
+        "-y",
+        "--no-install-recommends",
+        "rm",
+        "-rf",
+        "/var/lib/apt/lists/*",
+    ]
+)
+
+
+def _logical_lines(content: str) -> list:
+    """Split a Dockerfile into lines, joining ``\\`` continuations with a space."""
+    lines = []
+    pending = []
+    physical = content.split("\n")
+    last = len(physical) - 1
+    for i, line in enumerate(physical):
+        if i < last and line.endswith("\\"):
+            pending.append(line[:-1])
+            continue
+        if pending:
+            pending.append(line)
+            line = " ".join(pending)
+            pending = []
+        lines.append(line)
+    return lines
+
+
+def _parse_apt_libs(content: str) -> set:
+    """
+    Extract package names from ``apt-get install ... -y <pkgs>`` commands.
+
+    Line-oriented scan over the Dockerfile using ``str.find``; no regex and
+    no whole-file copy. Packages are read after the first ``-y`` on the same
+    (continuation-joined) line, up to ``&&``, ``;`` or end of line. A ``-y``
+    ending its line takes the package list from the next non-blank line.
+    Arch/version suffixes (``libxml2:amd64``, ``pandoc=2.0``) are stripped.
+    """
+    libs = set()
+    lines = _logical_lines(content)
+    last = len(lines) - 1
+    i, pos = 0, 0
+
+    while i <= last:
+        line = lines[i]
+        pos = line.find("apt-get install", pos)
+        if pos == -1:
+            i, pos = i + 1, 0
+            continue
+
+        # First "-y" followed by whitespace (a line break counts)
+        size = len(line)
+        flag = line.find("-y", pos + 15)
+        while flag != -1:
+            if flag + 2 < size:
+                if line[flag + 2].isspace():
+                    break
+            elif i < last:
+                break
+            flag = line.find("-y", flag + 1)
+        if flag == -1:
+            i, pos = i + 1, 0
+            continue
+
+        # Package list starts at the next non-whitespace character
+        start = flag + 2
+        while start < size and line[start].isspace():
+            start += 1
+        while start == size and i < last:
+            i += 1
+            line = lines[i]
+            size = len(line)
+            start = size - len(line.lstrip())
+
+        # Package list stops at the next "&&" or ";" (or end of line)
+        stop, stop_len = size, 0
+        for sep in ("&&", ";"):
+            idx = line.find(sep, start, stop)
+            if idx != -1:
+                stop, stop_len = idx, len(sep)
+
+        for part in line[start:stop].split():
+            if part[0] == "-" or part in _APT_IGNORE:
+                continue
+            libs.add(part.partition(":")[0].partition("=")[0])
+
+        if stop_len:
+            pos = stop + stop_len
+        else:
+            i, pos = i + 1, 0
+
+    return libs
+
+
+def _r4r_fingerprint() -> str:
+    """Identify the r4r build and host platform the package is traced with."""
+    try:
+        st = os.stat(_R4R_BINARY)
+        build = f"{_R4R_BINARY}:{st.st_size}:{st.st_mtime_ns}"
+    except (OSError, TypeError):
+        build = ""
+    return f"{build}|{platform.system()}-{platform.machine()}"
+
+
+def _compute_content_hash(content: bytes) -> str:
+    """
+    Fingerprint notebook source for result caching.
+
+    The whole source is covered, prose included: the package ships the
+    notebook and its container render, which the diff compares against the
+    local one. The R version, r4r build and platform are included so
+    upgrading either tool invalidates it.
+    """
+    return render_key(content.decode("utf-8", errors="replace"), _r4r_fingerprint())
+
+
+def _compute_code_hash(content: str) -> str:
+    """
+    Fingerprint the parts of notebook source the traced environment depends on.
+
+    Prose is left out: the Dockerfile, Makefile and manifest only depend on
+    the code that runs, so sources with equal code hashes share a trace.
+    """
+    return code_key(content, _r4r_fingerprint())
+
 
 class R4RExecutor(BaseExecutor):
     """
@@ -23,6 +196,7 @@ class R4RExecutor(BaseExecutor):
     def __init__(self):
         super().__init__()
         self.storage_manager = StorageManager()
+        self.r4r_binary = _R4R_BINARY
 
     def execute(self, notebook_id: int) -> Dict[str, Any]:
         """
@@ -34,36 +208,95 @@ class R4RExecutor(BaseExecutor):
 
         final_dir = self.storage_manager.get_notebook_dir(notebook_id)
 
-        if not os.path.exists(os.path.join(final_dir, "notebook.Rmd")):
+        rmd_path = os.path.join(final_dir, "notebook.Rmd")
+        try:
+            st = os.stat(rmd_path)
+        except FileNotFoundError:
             return {"success": False, "error": "Run notebook first to generate .Rmd"}
 
-        with tempfile.TemporaryDirectory(dir="/tmp") as temp_dir:
-            rmd_path = os.path.join(temp_dir, "notebook.Rmd")
-            shutil.copy(os.path.join(final_dir, "notebook.Rmd"), rmd_path)
+        # An untouched notebook.Rmd keeps its recorded hash; read and hash it
+        # only when its size or mtime (or the r4r build) changed
+        stamp = f"{st.st_size}:{st.st_mtime_ns}:{_r4r_fingerprint()}"
+        recorded = self.storage_manager.read_marker(
+            final_dir, _CONTENT_HASH_FILE
+        ).split("\n")
+        source = None
+        if recorded[1:] == [stamp]:
+            content_hash = recorded[0]
+        else:
+            with open(rmd_path, "rb") as f:
+                source = f.read()
+            content_hash = _compute_content_hash(source)
+
+        # Same source as the artifacts already in final_dir: skip the trace
+        cached = self.storage_manager.read_json(final_dir, _RESULT_FILE)
+        if recorded[0] == content_hash and cached.get("content_hash") == content_hash:
+            self._log("Notebook unchanged, reusing package %s", content_hash)
+            if recorded[1:] != [stamp]:
+                # Rewritten but identical: record the new stamp so the
+                # next request can skip hashing again
+                self.storage_manager.write_file(
+                    final_dir, _CONTENT_HASH_FILE, f"{content_hash}\n{stamp}"
+                )
+            return {
+                **self._public_result(cached),
+                "cached": True,
+                "package_ready": self.storage_manager.zip_ready(notebook_id),
+            }
+
+        # Only prose changed: the traced environment still holds, so just
+        # re-render the notebook's HTML for the package
+        if source is not None and cached.get("content_hash"):
+            content = source.decode("utf-8", errors="replace")
+            if self._refresh_prose(notebook_id, final_dir, cached, content):
+                cached["content_hash"] = content_hash
+                self.storage_manager.replace_file(
+                    final_dir, _RESULT_FILE, json.dumps(cached)
+                )
+                self.storage_manager.write_file(
+                    final_dir, _CONTENT_HASH_FILE, f"{content_hash}\n{stamp}"
+                )
+                self.storage_manager.create_zip_async(notebook_id)
+                duration = time.time() - start_time
+                self._log_header(f"PACKAGE PROSE REFRESH DONE ({duration:.2f}s)")
+                return {
+                    **self._public_result(cached),
+                    "cached": True,
+                    "package_ready": False,
+                }
+
+        if self.r4r_binary is None:
+            return {"success": False, "error": "r4r binary not found"}
+
+        with scratch_dir(min_free_bytes=_R4R_MIN_SCRATCH_BYTES) as temp_dir:
+            self.storage_manager.link_or_copy(
+                rmd_path, os.path.join(temp_dir, "notebook.Rmd")
+            )
 
             self._log_section("R4R TRACE & BUILD")
             r4r_output_dir = os.path.join(temp_dir, "r4r_output")
 
-            r4r_binary = "/usr/local/bin/r4r"
-            if not os.path.exists(r4r_binary):
-                r4r_binary = "/usr/bin/r4r"
-
-            env = os.environ.copy()
-            env["HOME"] = "/home/r4r"
-            env["VISUAL"] = "/bin/true"  # Prevent interactive prompts
+            env = r_environment({**os.environ, **_R4R_ENV_OVERRIDES})
 
             r4r_cmd = [
-                r4r_binary,
+                self.r4r_binary,
                 "-v",
                 "--output",
                 r4r_output_dir,
                 "R",
                 "-e",
-                "rmarkdown::render('notebook.Rmd')",
+                # Intermediates are kept for re-rendering prose-only edits
+                "rmarkdown::render('notebook.Rmd', clean = FALSE)",
             ]
 
+            # Full trace goes to r4r.log; only the tail is returned to the client
             r4r_res = self._run_command(
-                cmd=r4r_cmd, cwd=temp_dir, env=env, desc="r4r Trace & Build"
+                cmd=r4r_cmd,
+                cwd=temp_dir,
+                env=env,
+                desc="r4r Trace & Build",
+                max_output_lines=LOG_TAIL_LINES,
+                log_path=self.storage_manager.get_log_path(notebook_id, "r4r.log"),
             )
 
             if r4r_res.returncode != 0:
@@ -73,92 +306,295 @@ class R4RExecutor(BaseExecutor):
                     "logs": r4r_res.stdout + r4r_res.stderr,
                 }
 
-            r4r_data = self._collect_r4r_metrics(r4r_output_dir)
+            # One directory scan instead of a stat() per artifact lookup
+            entries = self.storage_manager.scan_dir(r4r_output_dir)
+
+            manifest = {}
+            if "manifest.json" in entries:
+                manifest = self.storage_manager.read_json(
+                    r4r_output_dir, "manifest.json"
+                )
+            r4r_data = self._collect_r4r_metrics(r4r_output_dir, manifest, entries)
+
+            container_html = self._find_container_html(entries)
+            if container_html:
+                container_html = os.path.relpath(container_html, r4r_output_dir)
 
-            if os.path.exists(r4r_output_dir):
-                shutil.copytree(r4r_output_dir, final_dir, dirs_exist_ok=True)
+            if entries:
+                # Scratch output is discarded afterwards, so move rather than copy
+                self.storage_manager.promote_dir(r4r_output_dir, final_dir)
 
-            container_html = self.storage_manager.find_html_file(r4r_output_dir)
             if container_html:
-                shutil.copy(
-                    container_html, os.path.join(final_dir, "notebook_container.html")
+                promoted_html = os.path.join(final_dir, container_html)
+                self.storage_manager.link_or_copy(
+                    promoted_html, os.path.join(final_dir, "notebook_container.html")
                 )
 
-            zip_path = self.storage_manager.create_zip(notebook_id)
+            # The zip is only needed for download, so it is built after we
+            # return; package_status reports when it can be downloaded
+            self.storage_manager.create_zip_async(notebook_id)
+            # Only artifacts from this run; final_dir may hold older ones
+            artifacts = {"dockerfile": "", "makefile": ""}
+            for key, name in (("dockerfile", "Dockerfile"), ("makefile", "Makefile")):
+                if name in entries:
+                    artifacts[key] = self.storage_manager.read_file(final_dir, name)
+
             duration = time.time() - start_time
             self._log_header(f"PACKAGE GENERATION DONE ({duration:.2f}s)")
 
-            return {
+            result = {
                 "success": True,
                 "build_success": r4r_res.returncode == 0,
                 "duration_seconds": duration,
                 "r4r_data": r4r_data,
-                "dockerfile": self.storage_manager.read_file(final_dir, "Dockerfile"),
-                "makefile": self.storage_manager.read_file(final_dir, "Makefile"),
-                "manifest": self.storage_manager.read_json(final_dir, "manifest.json"),
+                "dockerfile": artifacts["dockerfile"],
+                "makefile": artifacts["makefile"],
+                "manifest": manifest,
                 "logs": r4r_res.stdout,
-                "package_ready": zip_path is not None,
+                "package_ready": False,
             }
+            self._keep_render_inputs(notebook_id, temp_dir)
+            # Tagged with its hash, so a result is never paired with the
+            # wrong source even if the marker below is not written
+            self.storage_manager.replace_file(
+                final_dir,
+                _RESULT_FILE,
+                json.dumps(
+                    {
+                        **result,
+                        "content_hash": content_hash,
+                        "container_html": container_html,
+                    }
+                ),
+            )
+            # Hidden, so it is left out of the zip
+            self.storage_manager.write_file(
+                final_dir, _CONTENT_HASH_FILE, f"{content_hash}\n{stamp}"
+            )
+            return result
+
+    @staticmethod
+    def _public_result(stored: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip bookkeeping fields from a stored result."""
+        return {k: v for k, v in stored.items() if k not in _RESULT_PRIVATE_KEYS}
+
+    def _keep_render_inputs(self, notebook_id: int, temp_dir: str):
+        """
+        Keep the traced source and its knitr intermediates for prose refreshes.
 
-    def _collect_r4r_metrics(self, r4r_output_dir: str) -> dict:
-        """Parses R packages, system libraries, and file access counts from output artifacts."""
+        Args:
+            notebook_id: ID of the notebook
+            temp_dir: Working directory the trace ran in
+        """
+        render_dir = os.path.join(
+            self.storage_manager.base_dir, str(notebook_id), _RENDER_DIR
+        )
+        # Never leave intermediates of an older trace next to this result
+        shutil.rmtree(render_dir, ignore_errors=True)
+        entries = self.storage_manager.scan_dir(temp_dir)
+        if "notebook.knit.md" not in entries:
+            return
+        os.makedirs(render_dir)
+        for name in ("notebook.Rmd", "notebook.knit.md"):
+            self.storage_manager.move_file(
+                entries[name].path, os.path.join(render_dir, name)
+            )
+        if "notebook_files" in entries:
+            self.storage_manager.promote_dir(
+                entries["notebook_files"].path,
+                os.path.join(render_dir, "notebook_files"),
+            )
+
+    def _refresh_prose(
+        self, notebook_id: int, final_dir: str, cached: Dict[str, Any], content: str
+    ) -> bool:
+        """
+        Bring the package up to date with a source whose code is unchanged.
+
+        The prose edits are spliced into the knitted markdown of the last
+        trace and converted with pandoc, so no chunk is evaluated and r4r is
+        not run. The notebook.Rmd in the package is already the new source.
+
+        Args:
+            notebook_id: ID of the notebook
+            final_dir: Notebook reproducibility directory
+            cached: Stored result of the last trace
+            content: New notebook source
+
+        Returns:
+            True if the package was refreshed, False if a full trace is needed
+        """
+        if "`r " in content:
+            return False  # Inline R code in prose is evaluated too
+        render_dir = os.path.join(
+            self.storage_manager.base_dir, str(notebook_id), _RENDER_DIR
+        )
+        old_rmd = self.storage_manager.read_file(render_dir, "notebook.Rmd")
+        old_md = self.storage_manager.read_file(render_dir, "notebook.knit.md")
+        if not old_rmd or not old_md:
+            return False
+        if _compute_code_hash(old_rmd) != _compute_code_hash(content):
+            return False
+        knit_md = _splice_prose(old_rmd, content, old_md)
+        if knit_md is None:
+            return False
+
+        container_html = cached.get("container_html")
+        if container_html:
+            with scratch_dir() as temp_dir:
+                self.storage_manager.write_file(temp_dir, "notebook.md", knit_md)
+                figures_dir = os.path.join(render_dir, "notebook_files")
+                if os.path.isdir(figures_dir):
+                    self.storage_manager.link_tree(
+                        figures_dir, os.path.join(temp_dir, "notebook_files")
+                    )
+                self._log("Only prose changed, re-rendering without r4r")
+                render_res = self._run_command(
+                    cmd=[
+                        "R",
+                        "-e",
+                        "rmarkdown::render('notebook.md', "
+                        "output_file='notebook.html', clean = FALSE)",
+                    ],
+                    cwd=temp_dir,
+                    env=r_environment(),
+                    desc="RMarkdown Render (prose only)",
+                    max_output_lines=LOG_TAIL_LINES,
+                    log_path=self.storage_manager.get_log_path(
+                        notebook_id, "r4r.log"
+                    ),
+                )
+                if render_res.returncode != 0:
+                    self._log("Prose-only render failed, running full trace")
+                    return False
+                promoted_html = os.path.join(final_dir, container_html)
+                self.storage_manager.move_file(
+                    os.path.join(temp_dir, "notebook.html"), promoted_html
+                )
+                self.storage_manager.link_or_copy(
+                    promoted_html, os.path.join(final_dir, "notebook_container.html")
+                )
+
+        self.storage_manager.replace_file(render_dir, "notebook.Rmd", content)
+        self.storage_manager.replace_file(render_dir, "notebook.knit.md", knit_md)
+        return True
+
+    def _find_container_html(
+        self, entries: Dict[str, os.DirEntry]
+    ) -> Optional[str]:
+        """
+        Locate the rendered HTML among scanned r4r output entries.
+
+        Top-level files are checked first, matching ``os.walk`` order; the
+        tree is only walked when the HTML must be in a subdirectory.
+        """
+        subdirs = []
+        for entry in entries.values():
+            if entry.is_dir():
+                # os.walk does not descend into symlinked directories
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(".html"):
+                return entry.path
+
+        for subdir in subdirs:
+            found = self.storage_manager.find_html_file(subdir)
+            if found:
+                return found
+        return None
+
+    def _collect_r4r_metrics(
+        self,
+        r4r_output_dir: str,
+        manifest: Optional[Dict[str, Any]] = None,
+        entries: Optional[Dict[str, os.DirEntry]] = None,
+    ) -> dict:
+        """
+        Parses R packages, system libraries, and file access counts from output artifacts.
+
+        The three artifacts are independent, so they are read concurrently.
+        Values already present in r4r's manifest.json are used as-is instead of
+        being recomputed from the raw artifacts. When ``entries`` (a scan of
+        the output directory) is given, artifacts missing from it are not
+        opened at all.
+        """
         metrics = {"r_packages": [], "system_libs": [], "files_accessed": 0}
+        manifest = manifest or {}
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(self._parse_r_packages, r4r_output_dir, entries),
+                pool.submit(self._system_libs, r4r_output_dir, manifest, entries),
+                pool.submit(
+                    self._count_files_accessed, r4r_output_dir, manifest, entries
+                ),
+            ]
+            for future in futures:
+                metrics.update(future.result())
 
-        # Parse R packages
+        return metrics
+
+    def _parse_r_packages(
+        self, r4r_output_dir: str, entries: Optional[Dict] = None
+    ) -> dict:
+        """Read pinned R package versions from install_r_packages.R."""
+        if entries is not None and "install_r_packages.R" not in entries:
+            return {}
         r_script = os.path.join(r4r_output_dir, "install_r_packages.R")
-        if os.path.exists(r_script):
+        try:
             with open(r_script, "r") as f:
-                found = re.findall(
-                    r"remotes::install_version\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]",
-                    f.read(),
-                )
-                metrics["r_packages"] = sorted(
-                    [f"{name} ({ver})" for name, ver in found]
-                )
+                found = _RE_INSTALL_VERSION.findall(f.read())
+        except FileNotFoundError:
+            return {}
+        return {"r_packages": sorted(f"{name} ({ver})" for name, ver in found)}
+
+    def _system_libs(
+        self, r4r_output_dir: str, manifest: dict, entries: Optional[Dict] = None
+    ) -> dict:
+        """List system libraries (manifest first, Dockerfile scan as fallback)."""
+        for key in ("system_libs", "system_packages"):
+            if isinstance(manifest.get(key), list):
+                return {"system_libs": sorted(set(map(str, manifest[key])))}
+        return self._parse_dockerfile_libs(r4r_output_dir, entries)
 
-        # Parse System Libraries
+    def _parse_dockerfile_libs(
+        self, r4r_output_dir: str, entries: Optional[Dict] = None
+    ) -> dict:
+        """Read apt system libraries from the generated Dockerfile."""
+        if entries is not None and "Dockerfile" not in entries:
+            return {}
         dockerfile_path = os.path.join(r4r_output_dir, "Dockerfile")
-        libs = set()
-        IGNORE_LIST = [
-            "RUN",
-            "apt-get",
-            "install",
-            "update",
-            "upgrade",
-            "&&",
-            "\\",
-            "sudo",
-            "-y",
-            "--no-install-recommends",
-            "rm",
-            "-rf",
-            "/var/lib/apt/lists/*",
-        ]
-
-        if os.path.exists(dockerfile_path):
+        try:
             with open(dockerfile_path, "r") as f:
-                content_flat = f.read().replace("\\\n", " ")
+                return {"system_libs": sorted(_parse_apt_libs(f.read()))}
+        except FileNotFoundError:
+            return {}
 
-            matches = re.findall(
-                r"apt-get install.*?-y\s+(.*?)(?:&&|;|\n|$)", content_flat
-            )
-            for match in matches:
-                for part in match.split():
-                    clean = part.strip()
-                    if not clean or clean.startswith("-") or clean in IGNORE_LIST:
-                        continue
-                    # Remove arch/version suffix (e.g. libxml2:amd64 or pandoc=2.0)
-                    libs.add(clean.split(":")[0].split("=")[0])
+    def _count_files_accessed(
+        self, r4r_output_dir: str, manifest: dict, entries: Optional[Dict] = None
+    ) -> dict:
+        """Count traced files (manifest first, archive scan as fallback)."""
+        if isinstance(manifest.get("files_accessed"), int):
+            return {"files_accessed": manifest["files_accessed"]}
+        if isinstance(manifest.get("files"), list):
+            return {"files_accessed": len(manifest["files"])}
+        if entries is not None and "archive.tar" not in entries:
+            return {}
 
-        metrics["system_libs"] = sorted(list(libs))
-
-        # Count accessed files
         archive_path = os.path.join(r4r_output_dir, "archive.tar")
-        if os.path.exists(archive_path):
-            try:
-                with tarfile.open(archive_path) as tar:
-                    metrics["files_accessed"] = len(tar.getmembers())
-            except Exception:
-                pass
+        try:
+            return {"files_accessed": self._count_tar_members(archive_path)}
+        except Exception:
+            # Missing or unreadable archive
+            return {}
 
-        return metrics
+    @staticmethod
+    def _count_tar_members(archive_path: str) -> int:
+        """Count archive entries by streaming headers instead of getmembers()."""
+        count = 0
+        with tarfile.open(archive_path, "r|*") as tar:
+            while tar.next() is not None:
+                count += 1
+                # Drop yielded headers so memory stays constant
+                tar.members.clear()
+        return count
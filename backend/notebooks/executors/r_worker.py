@@ -0,0 +1,300 @@
+"""
+Pool of long-lived R processes for running R scripts without paying
+interpreter startup on every render.
+
+Workers read R code from stdin and report completion with a sentinel line,
+so one ``R`` process can serve many renders. Disabled unless
+``R_WORKER_POOL_SIZE`` is set.
+"""
+
+import atexit
+import os
+import queue
+import selectors
+import subprocess
+import threading
+import time
+from typing import BinaryIO, Optional, Tuple
+
+from django.conf import settings
+
+from .base import _PIPE_CHUNK_SIZE, _TailBuffer
+from ..services.package_manager import r_environment
+
+_DONE_MARKER = b"__RWORKER_DONE__"
+
+# Recycle workers periodically so leaked R state/memory can't accumulate
+_MAX_JOBS_PER_WORKER = 50
+
+
+def _r_string(value: str) -> str:
+    """Quote a Python string as an R single-quoted string literal."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _wrap_script(script: str, cwd: str) -> bytes:
+    """
+    Wrap R code so it runs isolated in ``cwd`` and reports its exit status.
+
+    Errors are caught and turned into a non-zero status instead of ending the
+    worker. Afterwards the search path, options, environment variables, RNG
+    state and global environment are put back as they were, so the next job
+    starts clean. Loaded namespaces can't be unloaded safely; a job that
+    loaded some and also left new options behind (which may belong to them)
+    asks for the worker to be retired instead.
+    """
+    return f"""local({{
+    .rw_wd <- setwd({_r_string(cwd)})
+    .rw_search <- search()
+    .rw_ns <- loadedNamespaces()
+    .rw_opts <- options()
+    .rw_env <- Sys.getenv()
+    .rw_status <- tryCatch({{
+{script}
+        0L
+    }}, error = function(e) {{
+        message("Error: ", conditionMessage(e))
+        1L
+    }})
+    setwd(.rw_wd)
+    for (.rw_pkg in setdiff(search(), .rw_search)) {{
+        try(detach(.rw_pkg, character.only = TRUE), silent = TRUE)
+    }}
+    .rw_new_opts <- setdiff(names(options()), names(.rw_opts))
+    .rw_retire <- length(.rw_new_opts) > 0L &&
+        length(setdiff(loadedNamespaces(), .rw_ns)) > 0L
+    if (!.rw_retire) {{
+        options(setNames(vector("list", length(.rw_new_opts)), .rw_new_opts))
+        options(.rw_opts)
+    }}
+    Sys.unsetenv(setdiff(names(Sys.getenv()), names(.rw_env)))
+    do.call(Sys.setenv, as.list(.rw_env))
+    suppressWarnings(RNGkind("default", "default", "default"))
+    rm(list = ls(globalenv(), all.names = TRUE), envir = globalenv())
+    cat("\\n{_DONE_MARKER.decode()}", .rw_status, as.integer(.rw_retire), "\\n")
+}})
+""".encode()
+
+
+def _split_done(pending: bytes) -> Optional[Tuple[bytes, int, bool]]:
+    """
+    Look for a complete sentinel line in buffered worker output.
+
+    Returns:
+        Tuple of (output before the sentinel, exit status, whether the worker
+        should be retired), or None if the sentinel line has not been fully
+        received yet
+    """
+    idx = pending.find(_DONE_MARKER)
+    if idx < 0:
+        return None
+    end = pending.find(b"\n", idx)
+    if end < 0:
+        return None
+    fields = pending[idx + len(_DONE_MARKER) : end].split()
+    try:
+        status = int(fields[0])
+    except (IndexError, ValueError):
+        status = 1
+    retire = fields[1:2] == [b"1"]
+    output = pending[:idx]
+    if output.endswith(b"\n"):
+        output = output[:-1]
+    return output, status, retire
+
+
+class RWorker:
+    """A single ``R --slave`` process fed scripts over stdin."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["R", "--slave", "--vanilla"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=r_environment(),
+        )
+        self.jobs = 0
+        # Set when a job left state behind that can't be reset
+        self.retire = False
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run(
+        self,
+        script: str,
+        cwd: str,
+        timeout: float,
+        max_lines: int,
+        log_file: Optional[BinaryIO] = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run R code in this worker and wait for it to finish.
+
+        stdout and stderr are merged, so all output is returned as stdout.
+        On timeout the worker is killed and returncode 124 is returned.
+        """
+        self.jobs += 1
+        cmd = ["R", "--slave"]
+        tail = _TailBuffer(max_lines)
+        self.proc.stdin.write(_wrap_script(script, cwd))
+        self.proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        fd = self.proc.stdout.fileno()
+        pending = b""
+        keep = len(_DONE_MARKER) + 16
+
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not sel.select(timeout=remaining):
+                    self.close()
+                    return subprocess.CompletedProcess(
+                        args=cmd, returncode=124, stdout="", stderr="Timeout"
+                    )
+
+                chunk = os.read(fd, _PIPE_CHUNK_SIZE)
+                if not chunk:
+                    # The script ended the R session (e.g. quit()) or R crashed
+                    tail.feed(pending)
+                    if log_file is not None:
+                        log_file.write(pending)
+                    self.proc.wait()
+                    return subprocess.CompletedProcess(
+                        args=cmd,
+                        returncode=self.proc.returncode or 1,
+                        stdout=tail.text(),
+                        stderr="R worker exited unexpectedly",
+                    )
+
+                pending += chunk
+                done = _split_done(pending)
+                if done is not None:
+                    output, status, self.retire = done
+                    tail.feed(output)
+                    if log_file is not None:
+                        log_file.write(output)
+                    return subprocess.CompletedProcess(
+                        args=cmd, returncode=status, stdout=tail.text(), stderr=""
+                    )
+
+                # Hold back enough bytes to spot a marker split across reads
+                if len(pending) > keep:
+                    flushed, pending = pending[:-keep], pending[-keep:]
+                    tail.feed(flushed)
+                    if log_file is not None:
+                        log_file.write(flushed)
+
+    def close(self):
+        """Terminate the R process."""
+        if self.alive:
+            self.proc.kill()
+        self.proc.wait()
+
+
+class RWorkerPool:
+    """
+    Fixed-size pool of warm R workers.
+
+    Workers are started lazily and replaced when they die, time out, ask to
+    be retired, or have served ``_MAX_JOBS_PER_WORKER`` jobs.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._workers = set()
+
+    def run(
+        self,
+        script: str,
+        cwd: str,
+        timeout: float = 900,
+        max_lines: int = 10000,
+        log_path: Optional[str] = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run R code on an idle worker, blocking until one is free.
+
+        Args:
+            script: R source code to evaluate
+            cwd: Working directory for the script
+            timeout: Seconds before the worker is killed
+            max_lines: Number of trailing output lines to keep
+            log_path: File that receives the full, untruncated output
+
+        Returns:
+            CompletedProcess with the script's status and output
+        """
+        with self._slots:
+            worker = self._acquire()
+            try:
+                if log_path:
+                    with open(log_path, "wb") as log_file:
+                        result = worker.run(script, cwd, timeout, max_lines, log_file)
+                else:
+                    result = worker.run(script, cwd, timeout, max_lines)
+            except BaseException:
+                self._discard(worker)
+                raise
+            self._release(worker)
+            return result
+
+    def _acquire(self) -> RWorker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = RWorker()
+                with self._lock:
+                    self._workers.add(worker)
+                return worker
+            if worker.alive:
+                return worker
+            self._discard(worker)
+
+    def _release(self, worker: RWorker):
+        if worker.alive and not worker.retire and worker.jobs < _MAX_JOBS_PER_WORKER:
+            self._idle.put(worker)
+        else:
+            self._discard(worker)
+
+    def _discard(self, worker: RWorker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.close()
+
+    def shutdown(self):
+        """Stop all workers."""
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            worker.close()
+
+
+_pool: Optional[RWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> Optional[RWorkerPool]:
+    """
+    Return the shared worker pool, or None when it is disabled.
+
+    The pool is created on first use with ``settings.R_WORKER_POOL_SIZE``
+    workers; a size of 0 (the default) keeps one R process per run.
+    """
+    global _pool
+    size = getattr(settings, "R_WORKER_POOL_SIZE", 0)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = RWorkerPool(size)
+            atexit.register(_pool.shutdown)
+        return _pool
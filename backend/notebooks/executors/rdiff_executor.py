@@ -4,12 +4,19 @@ Compares local and container HTML outputs to detect reproducibility issues.
 """
 
 import os
-import tempfile
 import time
 from typing import Dict, Any
-from .base import BaseExecutor
+
+from django.conf import settings
+
+from .base import BaseExecutor, scratch_dir
+from ..services.render_cache import RenderCache, files_key
 from ..services.storage_manager import StorageManager
 
+# r-diff install location, checked once at import
+_RDIFF_BINARY = "/usr/local/bin/r-diff"
+_RDIFF_AVAILABLE = os.path.exists(_RDIFF_BINARY)
+
 
 class RDiffExecutor(BaseExecutor):
     """
@@ -20,7 +27,8 @@ class RDiffExecutor(BaseExecutor):
     def __init__(self):
         super().__init__()
         self.storage_manager = StorageManager()
-        self.rdiff_binary = "/usr/local/bin/r-diff"
+        self.rdiff_binary = _RDIFF_BINARY
+        self.diff_cache = RenderCache(base_dir=settings.DIFF_CACHE_DIR)
 
     def execute(self, notebook_id: int) -> Dict[str, Any]:
         """
@@ -60,11 +68,30 @@ class RDiffExecutor(BaseExecutor):
                 "error": "Container HTML not found. Generate package first.",
             }
 
-        if not os.path.exists(self.rdiff_binary):
+        if not self._binary_available():
             return {"success": False, "error": "r-diff binary not found"}
 
+        # Same pair of outputs as an earlier diff: reuse it
+        cache_key = None
+        if self.diff_cache.enabled:
+            cache_key = files_key(local_html, container_html)
+            cached_dir = self.diff_cache.lookup(cache_key)
+            if cached_dir is not None:
+                self._log("Outputs unchanged, reusing diff %s", cache_key)
+                self.storage_manager.link_or_copy(
+                    os.path.join(cached_dir, "semantic_diff.html"),
+                    os.path.join(final_dir, "semantic_diff.html"),
+                )
+                return {
+                    "success": True,
+                    "diff_html": self.storage_manager.read_file(
+                        final_dir, "semantic_diff.html"
+                    ),
+                    "logs": f"Reused cached diff {cache_key}",
+                }
+
         # Execute r-diff in a temporary directory
-        with tempfile.TemporaryDirectory(dir="/tmp") as temp_dir:
+        with scratch_dir() as temp_dir:
             diff_output = os.path.join(temp_dir, "semantic_diff.html")
 
             diff_cmd = [
@@ -79,9 +106,9 @@ class RDiffExecutor(BaseExecutor):
             diff_res = self._run_command(diff_cmd, cwd=temp_dir, desc="Running r-diff")
 
             # Log raw output for debugging
-            self._log(f"r-diff exit code: {diff_res.returncode}")
-            self._log(f"r-diff stdout:\n{diff_res.stdout}")
-            self._log(f"r-diff stderr:\n{diff_res.stderr}")
+            self._log("r-diff exit code: %s", diff_res.returncode)
+            self._log("r-diff stdout:\n%s", diff_res.stdout, level="DEBUG")
+            self._log("r-diff stderr:\n%s", diff_res.stderr, level="DEBUG")
 
             if diff_res.returncode != 0 or not os.path.exists(diff_output):
                 return {
@@ -91,11 +118,13 @@ class RDiffExecutor(BaseExecutor):
                 }
 
             # Persist the generated diff to the notebook directory
-            diff_html_content = self.storage_manager.read_file(
-                temp_dir, "semantic_diff.html"
+            final_diff = self.storage_manager.move_file(
+                diff_output, os.path.join(final_dir, "semantic_diff.html")
             )
-            self.storage_manager.write_file(
-                final_dir, "semantic_diff.html", diff_html_content
+            if cache_key is not None:
+                self.diff_cache.store(cache_key, {"semantic_diff.html": final_diff})
+            diff_html_content = self.storage_manager.read_file(
+                final_dir, "semantic_diff.html"
             )
 
             duration = time.time() - start_time
@@ -106,3 +135,9 @@ class RDiffExecutor(BaseExecutor):
                 "diff_html": diff_html_content,
                 "logs": diff_res.stdout,
             }
+
+    def _binary_available(self) -> bool:
+        """Check r-diff exists, reusing the import-time check for the default path."""
+        if self.rdiff_binary == _RDIFF_BINARY:
+            return _RDIFF_AVAILABLE
+        return os.path.exists(self.rdiff_binary)
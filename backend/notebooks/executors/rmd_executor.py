@@ -3,16 +3,74 @@ R Markdown Executor for simple local notebook execution.
 Renders R Markdown files to HTML without containerization.
 """
 
+import copy
+import functools
+import json
 import os
-import tempfile
-import shutil
 import time
-from typing import Dict, Any
-from .base import BaseExecutor
-from ..services.package_manager import RPackageManager
+from typing import Dict, Any, Optional, Tuple
+from .base import BaseExecutor, LOG_TAIL_LINES, scratch_dir
+from .r_worker import get_worker_pool
+from ..services.package_manager import RPackageManager, r_environment
+from ..services.render_cache import RenderCache, code_key, render_key, split_prose
 from ..services.storage_manager import StorageManager
 from ..services.static_analyzer import ReproducibilityAnalyzer
 
+# Issues whose output can change between runs of the same source
+_UNCACHEABLE_CATEGORIES = frozenset(
+    ["randomness", "timestamp", "external_data", "system_calls", "paths"]
+)
+
+# Render keys of the notebook's last run: full source, then code only
+_RENDER_HASH_FILE = ".render_hash"
+# Static analysis of the source, stored in each render cache entry
+_ANALYSIS_FILE = "analysis.json"
+
+# Stateless, so one instance is shared by every executor
+_ANALYZER = ReproducibilityAnalyzer()
+
+
+@functools.lru_cache(maxsize=128)
+def _analyze(content: str) -> Dict[str, Any]:
+    """Static analysis of ``content``, memoized across executions."""
+    return _ANALYZER.analyze(content)
+
+
+def _splice_prose(old_rmd: str, new_rmd: str, knit_md: str) -> Optional[str]:
+    """
+    Carry prose edits over into the knitted markdown of a previous render.
+
+    knitr copies prose between chunks through verbatim, so each edited
+    segment can be located in the old output and replaced. Chunk output is
+    left untouched.
+
+    Args:
+        old_rmd: Source the knitted markdown was produced from
+        new_rmd: Edited source with the same chunks
+        knit_md: knitr output for ``old_rmd``
+
+    Returns:
+        Knitted markdown for ``new_rmd``, or None if an edited segment cannot
+        be located unambiguously
+    """
+    old_parts, new_parts = split_prose(old_rmd), split_prose(new_rmd)
+    if len(old_parts) != len(new_parts):
+        return None
+
+    pieces, cursor = [], 0
+    for old, new in zip(old_parts, new_parts):
+        if old == new:
+            continue
+        if not old or knit_md.count(old) != 1:
+            return None
+        idx = knit_md.find(old)
+        if idx < cursor:
+            return None
+        pieces += [knit_md[cursor:idx], new]
+        cursor = idx + len(old)
+    pieces.append(knit_md[cursor:])
+    return "".join(pieces)
+
 
 class RmdExecutor(BaseExecutor):
     """
@@ -24,7 +82,8 @@ class RmdExecutor(BaseExecutor):
         super().__init__()
         self.package_manager = RPackageManager()
         self.storage_manager = StorageManager()
-        self.analyzer = ReproducibilityAnalyzer()
+        self.analyzer = _ANALYZER
+        self.render_cache = RenderCache()
 
     def execute(self, content: str, notebook_id: int) -> Dict[str, Any]:
         """
@@ -48,42 +107,102 @@ class RmdExecutor(BaseExecutor):
 
         final_dir = self.storage_manager.get_notebook_dir(notebook_id)
 
-        # Run static analysis (non-blocking)
-        try:
-            static_analysis = self.analyzer.analyze(content or "")
-            print(static_analysis)
-        except Exception:
-            static_analysis = {"issues": [], "total_issues": 0}
+        # Renders of deterministic notebooks are reused by source digest. Only
+        # cacheable sources have entries, so a hit needs no analysis first
+        cache_key = cached_dir = code_hash = prose_only = None
+        static_analysis = {}
+        if self.render_cache.enabled:
+            cache_key = render_key(content, self.package_manager.repo_url)
+            cached_dir = self.render_cache.lookup(cache_key)
+            if cached_dir is not None:
+                static_analysis = self.storage_manager.read_json(
+                    cached_dir, _ANALYSIS_FILE
+                )
+
+        if not static_analysis:
+            # Run static analysis (non-blocking)
+            try:
+                # Copied so callers cannot alter the memoized result
+                static_analysis = copy.deepcopy(_analyze(content or ""))
+                self._log("Static analysis: %s", static_analysis, level="DEBUG")
+            except Exception:
+                static_analysis = {"issues": [], "total_issues": 0}
 
-        with tempfile.TemporaryDirectory(dir="/tmp") as temp_dir:
+        if cached_dir is not None:
+            return self._cached_response(
+                cached_dir,
+                cache_key,
+                code_key(content, self.package_manager.repo_url),
+                content,
+                final_dir,
+                static_analysis,
+            )
+        if cache_key is not None:
+            if any(
+                issue["category"] in _UNCACHEABLE_CATEGORIES
+                for issue in static_analysis["issues"]
+            ):
+                cache_key = None
+            else:
+                code_hash = code_key(content, self.package_manager.repo_url)
+                prose_only = self._prose_only_source(final_dir, code_hash, content)
+
+        with scratch_dir() as temp_dir:
             # Write R Markdown content to file
             rmd_path = os.path.join(temp_dir, "notebook.Rmd")
             with open(rmd_path, "w", encoding="utf-8") as f:
                 f.write(content)
 
-            # Detect and install required packages
             packages = self.package_manager.detect_packages_from_content(content)
-            if packages:
-                self._log(f"Checking {len(packages)} R packages...")
-                install_result = self.package_manager.install_packages(
-                    packages, temp_dir
+            # Intermediates are kept so the render can be cached
+            if prose_only is not None:
+                # Only prose changed: convert the spliced markdown with pandoc,
+                # no chunk is evaluated
+                knit_md, figures_dir = prose_only
+                self._log("Only prose changed, skipping chunk evaluation")
+                with open(
+                    os.path.join(temp_dir, "notebook.md"), "w", encoding="utf-8"
+                ) as f:
+                    f.write(knit_md)
+                if os.path.isdir(figures_dir):
+                    self.storage_manager.link_tree(
+                        figures_dir, os.path.join(temp_dir, "notebook_files")
+                    )
+                script = (
+                    "rmarkdown::render('notebook.md', output_file='notebook.html', "
+                    "clean = FALSE)"
                 )
-                if install_result.returncode != 0:
-                    self._log(
-                        "Package installation warning (proceeding anyway)", level="WARN"
+            else:
+                # Install missing packages and render in one R process, so R
+                # and rmarkdown are only started once per execution
+                script = (
+                    "rmarkdown::render('notebook.Rmd', output_file='notebook.html', "
+                    "envir = new.env(parent = globalenv()), clean = FALSE)"
+                )
+                if packages:
+                    self._log("Checking %d R packages...", len(packages))
+                    script = (
+                        self.package_manager.build_install_script(packages) + script
                     )
 
-            # Render R Markdown to HTML
             self._log_section("RENDERING HTML")
-            render_res = self._run_command(
-                cmd=[
-                    "R",
-                    "-e",
-                    "rmarkdown::render('notebook.Rmd', output_file='notebook.html')",
-                ],
-                cwd=temp_dir,
-                desc="RMarkdown Render",
-            )
+            log_path = self.storage_manager.get_log_path(notebook_id, "render.log")
+            pool = get_worker_pool()
+            if pool is not None:
+                # Warm R session: no interpreter/rmarkdown startup per render
+                self._log("[RMarkdown Render] Running on R worker pool...")
+                render_res = pool.run(
+                    script, temp_dir, max_lines=LOG_TAIL_LINES, log_path=log_path
+                )
+            else:
+                render_res = self._run_command(
+                    cmd=["R", "-e", script],
+                    cwd=temp_dir,
+                    env=r_environment(),
+                    desc="RMarkdown Render",
+                    max_output_lines=LOG_TAIL_LINES,
+                    log_path=log_path,
+                )
 
             if render_res.returncode != 0:
                 return self._error_response(
@@ -92,16 +211,28 @@ class RmdExecutor(BaseExecutor):
                     static_analysis=static_analysis,
                 )
 
-            # Save artifacts
-            html_content = self.storage_manager.read_file(temp_dir, "notebook.html")
-
-            # Save HTML for display
-            self.storage_manager.write_file(
-                final_dir, "notebook_local.html", html_content
+            # Save HTML for display (moved, not rewritten)
+            rendered_html = os.path.join(temp_dir, "notebook.html")
+            local_html = os.path.join(final_dir, "notebook_local.html")
+            try:
+                self.storage_manager.move_file(rendered_html, local_html)
+            except FileNotFoundError:
+                # Replace rather than truncate: it may be linked from the cache
+                self.storage_manager.write_file(temp_dir, "notebook.html", "")
+                self.storage_manager.move_file(rendered_html, local_html)
+            else:
+                if cache_key is not None:
+                    self._store_render(
+                        temp_dir, local_html, cache_key, code_hash, static_analysis
+                    )
+            html_content = self.storage_manager.read_file(
+                final_dir, "notebook_local.html"
             )
 
             # Save source .Rmd for future package generation (r4r)
-            shutil.copy(rmd_path, os.path.join(final_dir, "notebook.Rmd"))
+            self.storage_manager.move_file(
+                rmd_path, os.path.join(final_dir, "notebook.Rmd")
+            )
 
             duration = time.time() - start_time
             self._log_header(f"SIMPLE EXECUTION DONE ({duration:.2f}s)")
@@ -113,3 +244,126 @@ class RmdExecutor(BaseExecutor):
                 "static_analysis": static_analysis,
                 "logs": render_res.stdout,
             }
+
+    def _prose_only_source(
+        self, final_dir: str, code_hash: str, content: str
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Prepare a pandoc-only render when only prose changed since the last run.
+
+        Args:
+            final_dir: Notebook reproducibility directory
+            code_hash: ``code_key`` of the content being executed
+            content: R Markdown content being executed
+
+        Returns:
+            Tuple of (knitted markdown for ``content``, figures directory of
+            the previous render), or None if the chunks must be evaluated
+        """
+        if "`r " in content:
+            return None  # Inline R code in prose is evaluated too
+        previous = self.storage_manager.read_marker(
+            final_dir, _RENDER_HASH_FILE
+        ).split()
+        if len(previous) != 2 or previous[1] != code_hash:
+            return None
+        cached_dir = self.render_cache.lookup(previous[0])
+        if cached_dir is None:
+            return None
+        old_rmd = self.storage_manager.read_file(cached_dir, "notebook.Rmd")
+        old_md = self.storage_manager.read_file(cached_dir, "notebook.knit.md")
+        if not old_rmd or not old_md:
+            return None
+        knit_md = _splice_prose(old_rmd, content, old_md)
+        if knit_md is None:
+            return None
+        return knit_md, os.path.join(cached_dir, "notebook_files")
+
+    def _store_render(
+        self,
+        temp_dir: str,
+        local_html: str,
+        cache_key: str,
+        code_hash: str,
+        static_analysis: Dict[str, Any],
+    ):
+        """
+        Add a finished render and its knitr intermediates to the render cache.
+
+        Args:
+            temp_dir: Working directory the render ran in
+            local_html: Published HTML output
+            cache_key: ``render_key`` of the rendered source
+            code_hash: ``code_key`` of the rendered source
+            static_analysis: Analysis results for the rendered source
+        """
+        self.storage_manager.write_file(
+            temp_dir, _ANALYSIS_FILE, json.dumps(static_analysis)
+        )
+        files = {
+            "notebook.html": local_html,
+            "notebook.Rmd": os.path.join(temp_dir, "notebook.Rmd"),
+            _ANALYSIS_FILE: os.path.join(temp_dir, _ANALYSIS_FILE),
+        }
+        entries = self.storage_manager.scan_dir(temp_dir)
+        # notebook.md is the spliced input of a prose-only render
+        for name in ("notebook.knit.md", "notebook.md"):
+            if name in entries:
+                files["notebook.knit.md"] = entries[name].path
+                break
+        if "notebook_files" in entries:
+            files["notebook_files"] = entries["notebook_files"].path
+
+        if self.render_cache.store(cache_key, files) is not None:
+            self.storage_manager.replace_file(
+                os.path.dirname(local_html),
+                _RENDER_HASH_FILE,
+                f"{cache_key}\n{code_hash}\n",
+            )
+
+    def _cached_response(
+        self,
+        cached_dir: str,
+        cache_key: str,
+        code_hash: str,
+        content: str,
+        final_dir: str,
+        static_analysis: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Publish a cached render to the notebook directory without running R.
+
+        Args:
+            cached_dir: Render cache entry for this source
+            cache_key: Key of that entry
+            code_hash: ``code_key`` of the content
+            content: R Markdown content being executed
+            final_dir: Notebook reproducibility directory
+            static_analysis: Analysis results for the content
+
+        Returns:
+            Execution result in the same shape as ``execute``
+        """
+        self._log("Notebook unchanged, reusing render %s", cache_key)
+        # Linked, never rewritten in place: the published files may share an
+        # inode with another cache entry
+        for cached_name, name in (
+            ("notebook.html", "notebook_local.html"),
+            ("notebook.Rmd", "notebook.Rmd"),
+        ):
+            self.storage_manager.link_or_copy(
+                os.path.join(cached_dir, cached_name), os.path.join(final_dir, name)
+            )
+        self.storage_manager.replace_file(
+            final_dir, _RENDER_HASH_FILE, f"{cache_key}\n{code_hash}\n"
+        )
+
+        return {
+            "success": True,
+            "html": self.storage_manager.read_file(final_dir, "notebook_local.html"),
+            "detected_packages": self.package_manager.detect_packages_from_content(
+                content
+            ),
+            "static_analysis": static_analysis,
+            "logs": f"Reused cached render {cache_key}",
+        }
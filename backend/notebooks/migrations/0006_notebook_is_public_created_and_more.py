@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:12
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0005_alter_notebook_content_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='notebook',
+            index=models.Index(fields=['is_public', 'created_at'], name='notebooks_n_is_publ_760611_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notebook',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='notebook_title_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(fields=['status', 'started_at'], name='notebooks_e_status_cb3a46_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reproducibilityanalysis',
+            index=models.Index(fields=['created_at'], name='notebooks_r_created_38995b_idx'),
+        ),
+    ]
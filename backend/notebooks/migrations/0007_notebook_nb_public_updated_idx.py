@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0006_notebook_is_public_created_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notebook',
+            index=models.Index(fields=['is_public', '-updated_at'], name='nb_public_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:05
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_content_sha256(apps, schema_editor):
+    Notebook = apps.get_model('notebooks', 'Notebook')
+    notebooks = Notebook.objects.only('id', 'content')
+    batch = []
+    for notebook in notebooks.iterator(chunk_size=500):
+        notebook.content_sha256 = hashlib.sha256(
+            (notebook.content or '').encode('utf-8')
+        ).hexdigest()
+        batch.append(notebook)
+        if len(batch) >= 500:
+            Notebook.objects.bulk_update(batch, ['content_sha256'])
+            batch = []
+    if batch:
+        Notebook.objects.bulk_update(batch, ['content_sha256'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0007_notebook_nb_public_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notebook',
+            name='content_sha256',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the R Markdown content', max_length=64),
+        ),
+        migrations.RunPython(fill_content_sha256, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notebook',
+            index=models.Index(fields=['author', 'content_sha256'], name='notebooks_n_author__dc655e_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0008_notebook_content_sha256'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notebook',
+            index=models.Index(fields=['author', 'is_public', '-updated_at'], name='nb_auth_pub_upd_idx'),
+        ),
+    ]
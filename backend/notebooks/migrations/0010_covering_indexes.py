@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0009_notebook_nb_auth_pub_upd_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='execution',
+            name='notebooks_e_noteboo_0b109f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notebook',
+            name='notebooks_n_author__6a87ac_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notebook',
+            index=models.Index(fields=['author', '-updated_at'], include=('title', 'is_public'), name='nb_author_updated_cov'),
+        ),
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(fields=['notebook', '-started_at'], include=('status',), name='exec_nb_started_cov'),
+        ),
+    ]
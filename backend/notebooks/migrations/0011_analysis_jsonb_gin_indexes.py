@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-16 13:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('notebooks', '0010_covering_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='reproducibilityanalysis',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['dependencies'], name='analysis_deps_gin', opclasses=['jsonb_path_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='reproducibilityanalysis',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['system_deps'], name='analysis_sysdeps_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
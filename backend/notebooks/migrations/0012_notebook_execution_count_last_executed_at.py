@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-16 15:10
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def fill_execution_stats(apps, schema_editor):
+    Notebook = apps.get_model('notebooks', 'Notebook')
+    notebooks = Notebook.objects.annotate(
+        n_executions=Count('executions'), last_started=Max('executions__started_at')
+    ).filter(n_executions__gt=0).only('id')
+    batch = []
+    for notebook in notebooks.iterator(chunk_size=500):
+        notebook.execution_count = notebook.n_executions
+        notebook.last_executed_at = notebook.last_started
+        batch.append(notebook)
+        if len(batch) >= 500:
+            Notebook.objects.bulk_update(batch, ['execution_count', 'last_executed_at'])
+            batch = []
+    if batch:
+        Notebook.objects.bulk_update(batch, ['execution_count', 'last_executed_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0011_analysis_jsonb_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notebook',
+            name='execution_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of executions'),
+        ),
+        migrations.AddField(
+            model_name='notebook',
+            name='last_executed_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='When the notebook was last executed', null=True),
+        ),
+        migrations.RunPython(fill_execution_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-16 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0012_notebook_execution_count_last_executed_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'running'])), fields=['status'], name='exec_status_live_idx'),
+        ),
+    ]
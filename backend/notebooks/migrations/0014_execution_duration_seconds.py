@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-16 16:05
+
+from django.db import migrations, models
+
+
+def fill_duration_seconds(apps, schema_editor):
+    Execution = apps.get_model('notebooks', 'Execution')
+    executions = Execution.objects.filter(completed_at__isnull=False).only(
+        'id', 'started_at', 'completed_at'
+    )
+    batch = []
+    for execution in executions.iterator(chunk_size=500):
+        delta = execution.completed_at - execution.started_at
+        execution.duration_seconds = round(delta.total_seconds(), 2)
+        batch.append(execution)
+        if len(batch) >= 500:
+            Execution.objects.bulk_update(batch, ['duration_seconds'])
+            batch = []
+    if batch:
+        Execution.objects.bulk_update(batch, ['duration_seconds'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notebooks', '0013_execution_exec_status_live_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='execution',
+            name='duration_seconds',
+            field=models.FloatField(blank=True, db_index=True, editable=False, help_text='Execution duration in seconds', null=True),
+        ),
+        migrations.RunPython(fill_duration_seconds, migrations.RunPython.noop),
+    ]
@@ -3,11 +3,61 @@ Django models for the Reproducible Notebook Application.
 Defines Notebook, Execution, and ReproducibilityAnalysis models.
 """
 
+import hashlib
+
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinLengthValidator
 
 
+class NotebookQuerySet(models.QuerySet):
+    """QuerySet helpers for loading notebooks together with their relations."""
+
+    def with_related(self, executions: bool = True):
+        """
+        Join author and analysis, and prefetch executions newest first.
+
+        Args:
+            executions: Whether to prefetch execution history as well.
+
+        Returns:
+            NotebookQuerySet that touches no further queries for these relations.
+        """
+        qs = self.select_related("author", "analysis")
+        if executions:
+            qs = qs.prefetch_related(
+                models.Prefetch(
+                    "executions", queryset=Execution.objects.order_by("-started_at")
+                )
+            )
+        return qs
+
+    def for_list(self):
+        """
+        Load only the columns notebook listings show.
+
+        Skips ``content`` and the analysis text columns, which can be large;
+        the analysis join only fetches its key so ``has_analysis`` still works.
+
+        Returns:
+            NotebookQuerySet with author and analysis joined.
+        """
+        return self.select_related("author", "analysis").only(
+            "id",
+            "title",
+            "author_id",
+            "author__username",
+            "created_at",
+            "updated_at",
+            "is_public",
+            "execution_count",
+            "analysis__id",
+            "analysis__notebook",
+        )
+
+
 class Notebook(models.Model):
     """
     R Markdown document with metadata and relationships.
@@ -19,6 +69,9 @@ class Notebook(models.Model):
         created_at: Timestamp when notebook was created.
         updated_at: Timestamp of last modification.
         is_public: Whether notebook is publicly visible.
+        content_sha256: SHA-256 of content, kept in sync on save.
+        execution_count: Number of executions, maintained by signals.
+        last_executed_at: Start time of the most recent execution.
     """
 
     title = models.CharField(
@@ -38,6 +91,58 @@ class Notebook(models.Model):
     is_public = models.BooleanField(
         default=False, help_text="Whether this notebook is publicly visible"
     )
+    content_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 of the R Markdown content",
+    )
+    execution_count = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of executions"
+    )
+    last_executed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="When the notebook was last executed",
+    )
+
+    objects = NotebookQuerySet.as_manager()
+
+    # Maintained by signals with F() updates; saving an instance must not
+    # write back the values it happened to load
+    COUNTER_FIELDS = frozenset(["execution_count", "last_executed_at"])
+
+    def save(self, *args, **kwargs):
+        """
+        Save notebook, refreshing the content hash when content is saved.
+
+        Updates of an existing row leave out COUNTER_FIELDS, so an edit that
+        loaded the notebook before a concurrent execution keeps its count.
+        """
+        update_fields = kwargs.get("update_fields")
+        if (
+            update_fields is None
+            and not self._state.adding
+            and not kwargs.get("force_insert")
+        ):
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key
+                and f.name not in self.COUNTER_FIELDS
+                and f.attname not in deferred
+            ]
+            kwargs["update_fields"] = update_fields
+        if update_fields is None or "content" in update_fields:
+            self.content_sha256 = hashlib.sha256(
+                (self.content or "").encode("utf-8")
+            ).hexdigest()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "content_sha256"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Return string representation of notebook."""
@@ -49,7 +154,29 @@ class Notebook(models.Model):
         verbose_name_plural = "Notebooks"
         indexes = [
             models.Index(fields=["-updated_at"]),
-            models.Index(fields=["author", "-updated_at"]),
+            # Covering: owner listings read title/visibility from the index
+            models.Index(
+                fields=["author", "-updated_at"],
+                include=["title", "is_public"],
+                name="nb_author_updated_cov",
+            ),
+            models.Index(fields=["is_public", "created_at"]),
+            # Public feed: filter on is_public, newest first
+            models.Index(
+                fields=["is_public", "-updated_at"], name="nb_public_updated_idx"
+            ),
+            # Owner listings filtered by visibility
+            models.Index(
+                fields=["author", "is_public", "-updated_at"],
+                name="nb_auth_pub_upd_idx",
+            ),
+            # Duplicate-content lookups per user
+            models.Index(fields=["author", "content_sha256"]),
+            # Trigram index backing title__icontains (admin search)
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="notebook_title_trgm_idx",
+            ),
         ]
 
 
@@ -64,6 +191,7 @@ class Execution(models.Model):
         error_message: Error message if execution failed.
         started_at: When execution began.
         completed_at: When execution finished (None if still running).
+        duration_seconds: Run time, stored when completed_at is saved.
     """
 
     EXECUTION_STATUS = [
@@ -93,19 +221,53 @@ class Execution(models.Model):
     )
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Execution duration in seconds",
+    )
 
     class Meta:
         ordering = ["-started_at"]
         verbose_name = "Execution"
         verbose_name_plural = "Executions"
         indexes = [
-            models.Index(fields=["notebook", "-started_at"]),
+            # Covering: execution history/status lookups skip the heap
+            models.Index(
+                fields=["notebook", "-started_at"],
+                include=["status"],
+                name="exec_nb_started_cov",
+            ),
+            models.Index(fields=["status", "started_at"]),
+            # Partial: only in-flight executions, for polling live runs
+            models.Index(
+                fields=["status"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="exec_status_live_idx",
+            ),
         ]
 
+    def save(self, *args, **kwargs):
+        """Save execution, storing the duration once it has completed."""
+        self.duration_seconds = self._compute_duration()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "completed_at" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "duration_seconds"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """Return string representation of execution."""
         return f"{self.notebook.title} - {self.status} - {self.started_at}"
 
+    def _compute_duration(self):
+        """Seconds between start and completion, or None while running."""
+        if self.completed_at and self.started_at:
+            delta = self.completed_at - self.started_at
+            return round(delta.total_seconds(), 2)
+        return None
+
     @property
     def duration(self):
         """
@@ -114,10 +276,9 @@ class Execution(models.Model):
         Returns:
             float: Duration in seconds rounded to 2 decimals, or None if not completed.
         """
-        if self.completed_at and self.started_at:
-            delta = self.completed_at - self.started_at
-            return round(delta.total_seconds(), 2)
-        return None
+        if self.duration_seconds is not None:
+            return self.duration_seconds
+        return self._compute_duration()
 
 
 class ReproducibilityAnalysis(models.Model):
@@ -168,6 +329,20 @@ class ReproducibilityAnalysis(models.Model):
     class Meta:
         verbose_name = "Reproducibility Analysis"
         verbose_name_plural = "Reproducibility Analyses"
+        indexes = [
+            models.Index(fields=["created_at"]),
+            # Containment lookups (dependencies__contains=[...]) use @>
+            GinIndex(
+                fields=["dependencies"],
+                opclasses=["jsonb_path_ops"],
+                name="analysis_deps_gin",
+            ),
+            GinIndex(
+                fields=["system_deps"],
+                opclasses=["jsonb_path_ops"],
+                name="analysis_sysdeps_gin",
+            ),
+        ]
 
     def __str__(self):
         """Return string representation of analysis."""
@@ -0,0 +1,36 @@
+"""
+Pagination classes for notebook API list endpoints.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Cursor pagination that only applies when the client asks for it.
+
+    Existing clients (the Vue frontend) expect plain JSON arrays from list
+    endpoints, so a request is paginated only when it carries a ``cursor``
+    or ``page_size`` query parameter. Paginated responses walk the
+    queryset by the view's ``ordering`` so each page is an index range scan.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = "-created_at"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.page_size_query_param not in params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "ordering", None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
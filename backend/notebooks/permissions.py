@@ -15,5 +15,5 @@ class IsOwnerOrReadOnlyIfPublic(permissions.BasePermission):
             if obj.is_public:
                 return True
 
-        # Write permissions only for owner
-        return obj.author == request.user
+        # Write permissions only for owner; compare ids so author isn't fetched
+        return obj.author_id == request.user.id
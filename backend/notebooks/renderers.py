@@ -0,0 +1,36 @@
+"""
+Response renderers for the notebook API.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Analysis payloads (diff HTML, r4r metrics) can be large, and orjson
+    serializes them several times faster than the stdlib encoder. Types
+    orjson does not know (Decimal, lazy strings, querysets) are handed to
+    DRF's encoder. Falls back to the stock renderer if orjson is missing or
+    the client asked for indented output.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
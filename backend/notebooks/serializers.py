@@ -4,10 +4,45 @@ REST Framework serializers for transforming models to/from JSON.
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from .models import Notebook, ReproducibilityAnalysis, Execution
 from django.contrib.auth.password_validation import validate_password
 
 
+class EagerLoadingMixin:
+    """
+    Declares the relations a serializer reads so views can load them up front.
+
+    Attributes:
+        select_related_fields: Forward FK / one-to-one relations to JOIN.
+        prefetch_related_fields: Reverse or many-valued relations to prefetch.
+        deferred_fields: Large columns the serializer never reads.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    deferred_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Apply select_related/prefetch_related for the serializer's relations.
+
+        Args:
+            queryset: Base queryset for the serializer's model.
+
+        Returns:
+            QuerySet: Queryset with eager loading applied.
+        """
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        if cls.deferred_fields:
+            queryset = queryset.defer(*cls.deferred_fields)
+        return queryset
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for User model with password handling.
@@ -117,7 +152,9 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class ReproducibilityAnalysisSerializer(serializers.ModelSerializer):
+class ReproducibilityAnalysisSerializer(
+    EagerLoadingMixin, serializers.ModelSerializer
+):
     """
     Serializer for ReproducibilityAnalysis model.
 
@@ -125,6 +162,8 @@ class ReproducibilityAnalysisSerializer(serializers.ModelSerializer):
         notebook_title: Read-only field showing notebook title.
     """
 
+    select_related_fields = ("notebook",)
+
     notebook_title = serializers.CharField(source="notebook.title", read_only=True)
 
     class Meta:
@@ -145,7 +184,25 @@ class ReproducibilityAnalysisSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
-class ExecutionSerializer(serializers.ModelSerializer):
+class ReproducibilityAnalysisListSerializer(ReproducibilityAnalysisSerializer):
+    """
+    Summary serializer for analysis listings.
+
+    Leaves out the generated Dockerfile, Makefile, and diff HTML, which are
+    only returned by the detail endpoint and are not loaded from the database.
+    """
+
+    deferred_fields = ("dockerfile", "makefile", "diff_html")
+
+    class Meta(ReproducibilityAnalysisSerializer.Meta):
+        fields = [
+            f
+            for f in ReproducibilityAnalysisSerializer.Meta.fields
+            if f not in ("dockerfile", "makefile", "diff_html")
+        ]
+
+
+class ExecutionSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Serializer for Execution model.
 
@@ -154,6 +211,8 @@ class ExecutionSerializer(serializers.ModelSerializer):
         duration_seconds: Computed field showing execution duration.
     """
 
+    select_related_fields = ("notebook",)
+
     notebook_title = serializers.CharField(source="notebook.title", read_only=True)
     duration_seconds = serializers.SerializerMethodField(read_only=True)
 
@@ -185,7 +244,7 @@ class ExecutionSerializer(serializers.ModelSerializer):
         return obj.duration
 
 
-class NotebookSerializer(serializers.ModelSerializer):
+class NotebookSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Full serializer for Notebook model.
 
@@ -198,6 +257,14 @@ class NotebookSerializer(serializers.ModelSerializer):
         has_analysis: Computed boolean for analysis existence.
     """
 
+    select_related_fields = ("author", "analysis")
+    prefetch_related_fields = (
+        Prefetch(
+            "executions",
+            queryset=Execution.objects.only("id", "notebook", "status", "started_at"),
+        ),
+    )
+
     author = serializers.ReadOnlyField(source="author.username")
     author_id = serializers.ReadOnlyField(source="author.id")
     analysis = ReproducibilityAnalysisSerializer(read_only=True)
@@ -242,9 +309,9 @@ class NotebookSerializer(serializers.ModelSerializer):
             obj: Notebook instance.
 
         Returns:
-            int: Count of executions.
+            int: Count of executions (stored on the notebook, no COUNT query).
         """
-        return obj.executions.count()
+        return obj.execution_count
 
     def get_last_execution_status(self, obj):
         """
@@ -314,7 +381,7 @@ class NotebookSerializer(serializers.ModelSerializer):
         return value
 
 
-class NotebookListSerializer(serializers.ModelSerializer):
+class NotebookListSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for notebook lists (excludes content).
 
@@ -341,6 +408,19 @@ class NotebookListSerializer(serializers.ModelSerializer):
             "has_analysis",
         ]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Restrict the queryset to the listed columns.
+
+        Args:
+            queryset: Base Notebook queryset.
+
+        Returns:
+            QuerySet: Queryset from ``NotebookQuerySet.for_list()``.
+        """
+        return queryset.for_list()
+
     def get_execution_count(self, obj):
         """
         Get total executions count.
@@ -349,9 +429,9 @@ class NotebookListSerializer(serializers.ModelSerializer):
             obj: Notebook instance.
 
         Returns:
-            int: Count of executions.
+            int: Count of executions (stored on the notebook, no COUNT query).
         """
-        return obj.executions.count()
+        return obj.execution_count
 
     def get_has_analysis(self, obj):
         """
@@ -3,9 +3,124 @@ R Package Manager service for detecting and installing R packages.
 Handles package resolution from R Markdown content and installation via CRAN.
 """
 
+import functools
+import os
 import subprocess
 import re
-from typing import List
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+try:
+    # SIMD literal scanning for large notebooks (pip install hyperscan)
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# library()/require() calls, capturing the package name
+_RE_LIBRARY_CALL = re.compile(r'(?:library|require)\s*\(\s*["\']?([a-zA-Z0-9\.]+)')
+
+# Below this size a single re.findall pass beats setting up a scan
+_HS_MIN_CHARS = 64 * 1024
+
+
+def _compile_call_prefilter():
+    """Hyperscan database matching the call names, or None without hyperscan."""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    # Both names are 7 characters, so a match ending at i starts at i - 7
+    db.compile(expressions=[b"library|require"], ids=[0], elements=1, flags=[0])
+    return db
+
+
+_HS_DB = _compile_call_prefilter()
+# A database's default scratch space must not be used by two scans at once
+_HS_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def r_lib_dir() -> Optional[str]:
+    """
+    Persistent R library that packages are installed into, created on first use.
+
+    Set by settings.R_LIBS_CACHE_DIR (storage/rlib under the project by
+    default), so installs survive container rebuilds and are shared by every
+    render. Returns None (R's default library) when the directory cannot be
+    created.
+    """
+    path = getattr(settings, "R_LIBS_CACHE_DIR", "")
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    try:
+        os.makedirs(path, exist_ok=True)
+        return path
+    except OSError:
+        return None
+
+
+# Seconds a render waits for another one's package install before going ahead
+_INSTALL_LOCK_WAIT_SECONDS = 300
+# Install locks older than this (the render timeout) are left over from a
+# killed R process
+_INSTALL_LOCK_STALE_SECONDS = 900
+
+
+def r_environment(base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Build an environment for R subprocesses with the shared library first.
+
+    Args:
+        base: Environment to extend (defaults to os.environ)
+
+    Returns:
+        New environment dict with R_LIBS_USER pointing at ``r_lib_dir()``
+    """
+    env = dict(os.environ if base is None else base)
+    lib_dir = r_lib_dir()
+    if lib_dir:
+        existing = env.get("R_LIBS_USER")
+        env["R_LIBS_USER"] = f"{lib_dir}{os.pathsep}{existing}" if existing else lib_dir
+    return env
+
+
+def _find_packages(content: str) -> Set[str]:
+    """
+    Package names from library()/require() calls in ``content``.
+
+    Large ASCII sources are prefiltered with hyperscan, and the pattern is
+    only tried where a call name occurs. Starts are visited left to right
+    without overlapping earlier matches, which gives the same result as
+    ``re.findall``.
+    """
+    if _HS_DB is None or len(content) < _HS_MIN_CHARS or not content.isascii():
+        return set(_RE_LIBRARY_CALL.findall(content))
+
+    starts = []
+
+    def on_match(_id, _from, to, _flags, _context):
+        starts.append(to - 7)
+
+    with _HS_LOCK:
+        _HS_DB.scan(content.encode("ascii"), match_event_handler=on_match)
+
+    found, end = set(), 0
+    for start in sorted(starts):
+        if start < end:
+            continue
+        match = _RE_LIBRARY_CALL.match(content, start)
+        if match:
+            found.add(match.group(1))
+            end = match.end()
+    return found
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_packages(content: str) -> Tuple[str, ...]:
+    """Sorted unique package names loaded in ``content`` (memoized)."""
+    return tuple(sorted(_find_packages(content)))
 
 
 class RPackageManager:
@@ -39,11 +154,76 @@ class RPackageManager:
         if not content:
             return []
 
-        # Match library() and require() calls
-        packages = re.findall(
-            r'(?:library|require)\s*\(\s*["\']?([a-zA-Z0-9\.]+)', content
-        )
-        return sorted(list(set(packages)))
+        # Memoized: the same source is scanned more than once per execution
+        return list(_detect_packages(content))
+
+    def build_install_script(self, packages: List[str]) -> str:
+        """
+        Build R code that installs any of the given packages that are missing.
+
+        The code runs inside ``local()`` and only loads namespaces, so it can
+        be prepended to a render script without attaching packages or leaving
+        variables in the global environment the notebook is evaluated in.
+        Missing packages are installed in one ``install.packages`` call, so
+        dependencies are resolved once and built in parallel across all cores.
+        Install failures are reported as messages and never abort the script.
+
+        Args:
+            packages: List of package names to install
+
+        Returns:
+            R source code
+        """
+        return f"""
+        local({{
+            pkgs <- c('{ "', '".join(packages) }')
+            repo <- '{self.repo_url}'
+            lib <- .libPaths()[1]
+            installed <- vapply(pkgs, requireNamespace, logical(1), quietly = TRUE)
+            missing <- pkgs[!installed]
+            if (length(missing) > 0) {{
+                # Serialize installs into the shared library across renders;
+                # mkdir is atomic. Locks older than the render timeout belong
+                # to a killed process.
+                lock <- file.path(lib, ".install.lock")
+                waited <- 0
+                while (!(locked <- dir.create(lock, showWarnings = FALSE))) {{
+                    age <- difftime(Sys.time(), file.mtime(lock), units = "secs")
+                    if (!is.na(age) && age > {_INSTALL_LOCK_STALE_SECONDS}) {{
+                        unlink(lock, recursive = TRUE)
+                    }} else if (waited >= {_INSTALL_LOCK_WAIT_SECONDS}) {{
+                        break
+                    }} else {{
+                        Sys.sleep(1)
+                        waited <- waited + 1
+                    }}
+                }}
+                tryCatch({{
+                    # Another render may have installed them while we waited
+                    missing <- missing[
+                        !vapply(missing, requireNamespace, logical(1), quietly = TRUE)
+                    ]
+                    if (length(missing) > 0) {{
+                        message(
+                            paste("Installing missing packages:", toString(missing))
+                        )
+                        install.packages(
+                            missing,
+                            repos = repo,
+                            lib = lib,
+                            Ncpus = max(1L, parallel::detectCores(), na.rm = TRUE),
+                            INSTALL_opts = c("--no-docs", "--no-html", "--no-help"),
+                            quiet = TRUE
+                        )
+                    }}
+                }}, error = function(e) {{
+                    message(paste("Failed to install packages:", conditionMessage(e)))
+                }}, finally = if (locked) unlink(lock, recursive = TRUE))
+            }} else {{
+                message(paste("Packages already installed:", toString(pkgs)))
+            }}
+        }})
+        """
 
     def install_packages(
         self, packages: List[str], temp_dir: str
@@ -63,23 +243,10 @@ class RPackageManager:
                 args=[], returncode=0, stdout="No packages to install", stderr=""
             )
 
-        # Generate R script to check and install packages
-        install_script = f"""
-        pkgs <- c('{ "', '".join(packages) }')
-        repo <- '{self.repo_url}'
-        for (pkg in pkgs) {{
-            if (!require(pkg, character.only = TRUE, quietly = TRUE)) {{
-                message(paste("Installing missing package:", pkg))
-                install.packages(pkg, repos = repo)
-            }} else {{
-                message(paste("Package already installed:", pkg))
-            }}
-        }}
-        """
-
         result = subprocess.run(
-            ["R", "-e", install_script],
+            ["R", "-e", self.build_install_script(packages)],
             cwd=temp_dir,
+            env=r_environment(),
             capture_output=True,
             text=True,
         )
@@ -107,6 +274,7 @@ class RPackageManager:
 
         result = subprocess.run(
             ["R", "-e", check_script],
+            env=r_environment(),
             capture_output=True,
             text=True,
         )
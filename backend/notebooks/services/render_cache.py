@@ -0,0 +1,257 @@
+"""
+Content-addressed cache of rendered notebooks.
+Maps a digest of the R Markdown source (plus the R toolchain it was rendered
+with) to the files a render produced, so unchanged or reverted notebooks are
+not rendered again.
+"""
+
+import functools
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+try:
+    # SIMD hashing for cache keys (pip install blake3)
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# A fenced R chunk, header line through closing fence
+_RE_CODE_CHUNK = re.compile(r"^```\{r[^}]*\}[^\n]*\n.*?^```[ \t]*$", re.M | re.S)
+_RE_FRONT_MATTER = re.compile(r"\A---[ \t]*\n.*?^---[ \t]*$", re.M | re.S)
+
+# Characters encoded per hash update, bounding the temporary bytes object
+_HASH_CHUNK_CHARS = 64 * 1024
+
+
+def _resolve_cache_dir(path: str) -> Optional[str]:
+    """
+    Create a cache directory if needed.
+
+    Returns:
+        Absolute path, or None (cache disabled) when it cannot be created
+    """
+    if not path:
+        return None
+    path = os.path.abspath(path)
+    try:
+        os.makedirs(path, exist_ok=True)
+        return path
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def r_version() -> str:
+    """
+    Return the first line of ``R --version``, or "" if R cannot be run.
+
+    Part of the cache key, so upgrading R invalidates earlier renders.
+    """
+    try:
+        result = subprocess.run(
+            ["R", "--version"], capture_output=True, text=True, timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    return result.stdout.partition("\n")[0].strip()
+
+
+def _hash_text(parts: Iterable[str]) -> str:
+    """
+    Digest of NUL-terminated UTF-8 strings.
+
+    BLAKE3 when installed, otherwise SHA-256. BLAKE3 keys are prefixed with
+    ``b3-`` so keys from the two never collide. Long strings are encoded a
+    slice at a time instead of being copied to bytes whole.
+    """
+    digest = blake3() if blake3 is not None else hashlib.sha256()
+    for part in parts:
+        for start in range(0, len(part), _HASH_CHUNK_CHARS):
+            digest.update(part[start : start + _HASH_CHUNK_CHARS].encode("utf-8"))
+        digest.update(b"\0")
+    if blake3 is not None:
+        return "b3-" + digest.hexdigest()
+    return digest.hexdigest()
+
+
+def render_key(content: str, *context: str) -> str:
+    """
+    Digest identifying a render of ``content``.
+
+    Args:
+        content: R Markdown source
+        context: Other inputs the output depends on, such as the CRAN
+            repository packages are installed from
+
+    Returns:
+        Hex digest of the source, R version, and context
+    """
+    return _hash_text((content, r_version(), *context))
+
+
+def code_key(content: str, *context: str) -> str:
+    """
+    Digest of everything in ``content`` that affects evaluated output.
+
+    Covers the YAML front matter (which can set params) and every R chunk,
+    header included, but not the prose between chunks.
+
+    Args:
+        content: R Markdown source
+        context: Other inputs the output depends on, as for ``render_key``
+
+    Returns:
+        Hex digest, equal for sources that differ only in prose
+    """
+    front_matter = _RE_FRONT_MATTER.search(content)
+    parts = [front_matter.group() if front_matter else ""]
+    parts += _RE_CODE_CHUNK.findall(content)
+    # The chunk count keeps chunk and context strings from being confused
+    return _hash_text((*parts, str(len(parts)), r_version(), *context))
+
+
+def files_key(*paths: str) -> str:
+    """
+    Digest identifying the contents of several files, in order.
+
+    Args:
+        paths: Files to fingerprint
+
+    Returns:
+        Hex SHA-256 over the SHA-256 of each file
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+    return digest.hexdigest()
+
+
+def split_prose(content: str) -> List[str]:
+    """
+    Split R Markdown into the prose around its R chunks.
+
+    Returns:
+        Prose segments; there is always one more than there are chunks
+    """
+    return _RE_CODE_CHUNK.split(content)
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class RenderCache:
+    """
+    Directory per render key, holding the files that render produced.
+
+    Entries are written under a temporary name and renamed into place, so a
+    key directory is either complete or absent. Only the ``max_entries`` most
+    recently used entries (by directory mtime) are kept.
+    """
+
+    def __init__(
+        self, base_dir: Optional[str] = None, max_entries: Optional[int] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            base_dir: Cache root (defaults to settings.RENDER_CACHE_DIR)
+            max_entries: Entries to keep (defaults to settings.RENDER_CACHE_SIZE)
+        """
+        self._root = base_dir or getattr(settings, "RENDER_CACHE_DIR", "")
+        if max_entries is None:
+            max_entries = getattr(settings, "RENDER_CACHE_SIZE", 0)
+        self.max_entries = max_entries
+
+    @functools.cached_property
+    def base_dir(self) -> Optional[str]:
+        """Cache root, created on first use (None if it cannot be)."""
+        return _resolve_cache_dir(self._root)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and bool(self.base_dir)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Find the cached entry for a key and mark it as recently used.
+
+        Args:
+            key: Render key from ``render_key``
+
+        Returns:
+            Path to the entry directory, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        path = os.path.join(self.base_dir, key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key: str, files: Dict[str, str]) -> Optional[str]:
+        """
+        Copy rendered files into a new cache entry.
+
+        Files are hard linked when possible, so storing costs no extra space.
+
+        Args:
+            key: Render key from ``render_key``
+            files: Mapping of entry name to source file or directory path
+
+        Returns:
+            Path to the entry directory, or None if the cache is disabled or
+            the entry could not be written
+        """
+        if not self.enabled:
+            return None
+        path = os.path.join(self.base_dir, key)
+        tmp = tempfile.mkdtemp(dir=self.base_dir, prefix=".tmp-")
+        try:
+            for name, src in files.items():
+                dst = os.path.join(tmp, name)
+                if os.path.isdir(src):
+                    shutil.copytree(src, dst, copy_function=_link_or_copy)
+                else:
+                    _link_or_copy(src, dst)
+            os.rename(tmp, path)
+        except OSError:
+            # Another render stored the same key first, or the copy failed
+            shutil.rmtree(tmp, ignore_errors=True)
+            return path if os.path.isdir(path) else None
+        self._evict()
+        return path
+
+    def _evict(self):
+        """Remove the least recently used entries beyond ``max_entries``."""
+        entries = []
+        try:
+            with os.scandir(self.base_dir) as it:
+                for entry in it:
+                    if entry.name.startswith(".") or not entry.is_dir():
+                        continue
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        pass  # Evicted concurrently
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries :]:
+            shutil.rmtree(path, ignore_errors=True)
@@ -5,6 +5,28 @@ Static analysis tool for detecting reproducibility issues in R Markdown code.
 import re
 from typing import List, Dict
 
+# Patterns are compiled once at import rather than looked up per line
+_RE_TIMESTAMP = re.compile(r"Sys\.(time|Date|timezone)")
+_RE_DOWNLOAD = re.compile(r"download\.file|url\(")
+_RE_SYSTEM_CALL = re.compile(r"\b(system|system2)\s*\(")
+_RE_INSTALL = re.compile(r"install\.packages\s*\(")
+_RE_SETWD = re.compile(r"setwd\s*\(")
+_RE_INTERACTIVE = re.compile(r"\b(View|browser|edit|file\.choose)\s*\(")
+_RE_ABSOLUTE_PATH = re.compile(r'["\'](?:[a-zA-Z]:[\\/]|[\\/])[^"\']+["\']')
+_RANDOM_PATTERNS = [
+    (re.compile(r"\bsample\s*\("), "sample()"),
+    (re.compile(r"\brnorm\s*\("), "rnorm()"),
+    (re.compile(r"\brunif\s*\("), "runif()"),
+    (re.compile(r"\brbinom\s*\("), "rbinom()"),
+    (re.compile(r"\bsample_n\s*\("), "sample_n()"),
+]
+_SECRET_PATTERNS = [
+    re.compile(r"sk_live_[0-9a-zA-Z]{20,}"),
+    re.compile(
+        r"(?:api_key|access_token|secret)\s*=\s*['\"][a-zA-Z0-9_\-]{20,}['\"]"
+    ),
+]
+
 
 class ReproducibilityAnalyzer:
     """
@@ -45,7 +67,7 @@ class ReproducibilityAnalyzer:
             )
 
         # Check for time-dependent code
-        timestamp_lines = self._find_pattern_lines(lines, r"Sys\.(time|Date|timezone)")
+        timestamp_lines = self._find_pattern_lines(lines, _RE_TIMESTAMP)
         if timestamp_lines:
             issues.append(
                 {
@@ -73,7 +95,7 @@ class ReproducibilityAnalyzer:
             )
 
         # Check for external data downloads
-        download_lines = self._find_pattern_lines(lines, r"download\.file|url\(")
+        download_lines = self._find_pattern_lines(lines, _RE_DOWNLOAD)
         if download_lines:
             issues.append(
                 {
@@ -87,7 +109,7 @@ class ReproducibilityAnalyzer:
             )
 
         # Check for system(s) calls
-        system_lines = self._find_pattern_lines(lines, r"\b(system|system2)\s*\(")
+        system_lines = self._find_pattern_lines(lines, _RE_SYSTEM_CALL)
         if system_lines:
             issues.append(
                 {
@@ -100,7 +122,7 @@ class ReproducibilityAnalyzer:
                 }
             )
         # Check for install.packages()
-        install_lines = self._find_pattern_lines(lines, r"install\.packages\s*\(")
+        install_lines = self._find_pattern_lines(lines, _RE_INSTALL)
         if install_lines:
             issues.append(
                 {
@@ -114,7 +136,7 @@ class ReproducibilityAnalyzer:
             )
 
         # Check for setwd()
-        setwd_lines = self._find_pattern_lines(lines, r"setwd\s*\(")
+        setwd_lines = self._find_pattern_lines(lines, _RE_SETWD)
         if setwd_lines:
             issues.append(
                 {
@@ -128,9 +150,7 @@ class ReproducibilityAnalyzer:
             )
 
         # Check for interactive commands
-        interactive_lines = self._find_pattern_lines(
-            lines, r"\b(View|browser|edit|file\.choose)\s*\("
-        )
+        interactive_lines = self._find_pattern_lines(lines, _RE_INTERACTIVE)
         if interactive_lines:
             issues.append(
                 {
@@ -172,29 +192,24 @@ class ReproducibilityAnalyzer:
         Returns:
             List of dictionaries with line_number and code for each occurrence.
         """
-        random_patterns = [
-            (r"\bsample\s*\(", "sample()"),
-            (r"\brnorm\s*\(", "rnorm()"),
-            (r"\brunif\s*\(", "runif()"),
-            (r"\brbinom\s*\(", "rbinom()"),
-            (r"\bsample_n\s*\(", "sample_n()"),
-        ]
         found = []
         for line_num, line in enumerate(lines, start=1):
             if line.strip().startswith("#"):
                 continue
-            for pattern, func_name in random_patterns:
-                if re.search(pattern, line):
+            for pattern, func_name in _RANDOM_PATTERNS:
+                if pattern.search(line):
                     found.append({"line_number": line_num, "code": line.strip()})
         return found
 
-    def _find_pattern_lines(self, lines: List[str], pattern: str) -> List[Dict]:
+    def _find_pattern_lines(
+        self, lines: List[str], pattern: re.Pattern
+    ) -> List[Dict]:
         """
         Find lines matching a regex pattern.
 
         Args:
             lines: List of code lines.
-            pattern: Regular expression pattern to search for.
+            pattern: Compiled regular expression to search for.
 
         Returns:
             List of dictionaries with line_number and code for each match.
@@ -203,7 +218,7 @@ class ReproducibilityAnalyzer:
         for line_num, line in enumerate(lines, start=1):
             if line.strip().startswith("#"):
                 continue
-            if re.search(pattern, line):
+            if pattern.search(line):
                 found.append({"line_number": line_num, "code": line.strip()})
         return found
 
@@ -218,7 +233,6 @@ class ReproducibilityAnalyzer:
             List of dictionaries with line_number, code, and matched path.
         """
         found = []
-        path_pattern = r'["\'](?:[a-zA-Z]:[\\/]|[\\/])[^"\']+["\']'
 
         for line_num, line in enumerate(lines, start=1):
             if line.strip().startswith("#"):
@@ -228,7 +242,7 @@ class ReproducibilityAnalyzer:
             if "library(" in line or "require(" in line:
                 continue
 
-            matches = re.findall(path_pattern, line)
+            matches = _RE_ABSOLUTE_PATH.findall(line)
             for match in matches:
                 # Skip URLs
                 if "://" in match or "http" in match:
@@ -249,16 +263,12 @@ class ReproducibilityAnalyzer:
             List of dictionaries with line_number and masked code.
         """
         found = []
-        patterns = [
-            r"sk_live_[0-9a-zA-Z]{20,}",
-            r"(?:api_key|access_token|secret)\s*=\s*['\"][a-zA-Z0-9_\-]{20,}['\"]",
-        ]
 
         for line_num, line in enumerate(lines, start=1):
             if line.strip().startswith("#"):
                 continue
-            for p in patterns:
-                if re.search(p, line):
-                    masked_code = re.sub(p, "***SECRET***", line.strip())
+            for p in _SECRET_PATTERNS:
+                if p.search(line):
+                    masked_code = p.sub("***SECRET***", line.strip())
                     found.append({"line_number": line_num, "code": masked_code})
         return found
@@ -4,10 +4,57 @@ Handles notebook file storage, reading/writing, and ZIP package creation.
 """
 
 import os
+import errno
 import json
+import logging
+import shutil
+import tempfile
+import threading
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Already-compressed (or bulky binary) artifacts are stored as-is in packages
+_ZIP_STORED_EXTENSIONS = frozenset(
+    [
+        ".tar",
+        ".gz",
+        ".tgz",
+        ".bz2",
+        ".xz",
+        ".zst",
+        ".zip",
+        ".whl",
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".pdf",
+        # R serializes these gzip-compressed by default
+        ".rds",
+        ".rda",
+        ".rdata",
+    ]
+)
+
+
+# Package ZIPs are built off the request thread; at most one job per notebook
+# is tracked so downloads can wait for the newest one
+_zip_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="package-zip")
+_zip_jobs: Dict[int, Future] = {}
+_zip_jobs_lock = threading.Lock()
+
+# Written next to the package when its last ZIP build failed, so every
+# worker process can report the failure
+_ZIP_ERROR_FILE = ".package_error"
+
 
 class StorageManager:
     """
@@ -41,6 +88,21 @@ class StorageManager:
         os.makedirs(path, exist_ok=True)
         return path
 
+    def get_log_path(self, notebook_id: int, filename: str) -> str:
+        """
+        Get path for a full execution log, kept outside the packaged directory.
+
+        Args:
+            notebook_id: ID of the notebook
+            filename: Log file name
+
+        Returns:
+            Path to the log file in the notebook folder
+        """
+        path = os.path.join(self.base_dir, str(notebook_id))
+        os.makedirs(path, exist_ok=True)
+        return os.path.join(path, filename)
+
     def read_file(self, directory: str, filename: str) -> str:
         """
         Read text file from directory.
@@ -53,10 +115,37 @@ class StorageManager:
             File content as string, or empty string if file doesn't exist
         """
         path = os.path.join(directory, filename)
-        if os.path.exists(path):
+        try:
             with open(path, "r", errors="ignore") as f:
                 return f.read()
-        return ""
+        except FileNotFoundError:
+            return ""
+
+    def read_marker(self, directory: str, filename: str, max_bytes: int = 4096) -> str:
+        """
+        Read a short marker file (such as a stored hash) in one read() call.
+
+        Skips the buffered text file machinery, which dominates the cost of
+        reading a few dozen bytes.
+
+        Args:
+            directory: Directory path
+            filename: Name of file to read
+            max_bytes: Bytes to read at most
+
+        Returns:
+            Content with surrounding whitespace stripped, or empty string if
+            the file doesn't exist
+        """
+        try:
+            fd = os.open(os.path.join(directory, filename), os.O_RDONLY)
+        except FileNotFoundError:
+            return ""
+        try:
+            data = os.read(fd, max_bytes)
+        finally:
+            os.close(fd)
+        return data.decode("utf-8", errors="ignore").strip()
 
     def read_json(self, directory: str, filename: str) -> Dict[str, Any]:
         """
@@ -70,13 +159,13 @@ class StorageManager:
             Parsed JSON as dictionary, or empty dict if file doesn't exist or is invalid
         """
         path = os.path.join(directory, filename)
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            # orjson parses bytes directly, without a decode step
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:
+            return {}
 
     def write_file(self, directory: str, filename: str, content: str):
         """
@@ -92,62 +181,369 @@ class StorageManager:
         with open(path, "w", encoding="utf-8") as f:
             f.write(content)
 
+    def replace_file(self, directory: str, filename: str, content: str):
+        """
+        Write text content to a new file and rename it over filename.
+
+        Unlike ``write_file`` the existing file is never truncated, so other
+        hard links to it (such as render cache entries) keep their content.
+
+        Args:
+            directory: Directory path
+            filename: Name of file to write
+            content: Text content to write
+        """
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{filename}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, os.path.join(directory, filename))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def scan_dir(self, directory: str) -> Dict[str, os.DirEntry]:
+        """
+        List directory entries in a single scandir pass.
+
+        DirEntry caches file type information, so callers can test for
+        artifacts by name without one stat() per path.
+
+        Args:
+            directory: Directory to scan
+
+        Returns:
+            Mapping of entry name to DirEntry, in scandir order (empty if the
+            directory doesn't exist)
+        """
+        try:
+            with os.scandir(directory) as it:
+                return {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+
+    def link_or_copy(self, src: str, dst: str) -> str:
+        """
+        Place src at dst as a hard link, falling back to a byte copy.
+
+        Hard links only touch metadata, so promoting large artifacts is
+        independent of file size. Copying is used when src and dst live on
+        different filesystems or the filesystem does not support links.
+
+        Args:
+            src: Source file path
+            dst: Destination file path (replaced if it already exists)
+
+        Returns:
+            Destination path
+        """
+        try:
+            os.link(src, dst)
+        except FileExistsError:
+            os.unlink(dst)
+            return self.link_or_copy(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+        return dst
+
+    def link_tree(self, src: str, dst: str) -> str:
+        """
+        Recreate a directory tree at dst with its files hard linked from src.
+
+        Args:
+            src: Source directory
+            dst: Destination directory (must not exist)
+
+        Returns:
+            Destination path
+        """
+        return shutil.copytree(src, dst, copy_function=self.link_or_copy)
+
+    def move_file(self, src: str, dst: str) -> str:
+        """
+        Move src to dst, replacing dst if it exists.
+
+        Same-filesystem moves are a single rename; a byte copy is only made
+        when src and dst are on different filesystems.
+
+        Args:
+            src: Source file path (removed on success)
+            dst: Destination file path
+
+        Returns:
+            Destination path
+        """
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.copy2(src, dst)
+            os.unlink(src)
+        return dst
+
+    def promote_dir(self, src: str, dst: str) -> str:
+        """
+        Move the contents of a scratch directory tree into dst.
+
+        When dst is missing (or empty) the whole tree is renamed in one step;
+        otherwise files are moved individually and merged into dst. src is
+        consumed either way, so it must not be read afterwards.
+
+        Args:
+            src: Source directory
+            dst: Destination directory (created or merged into)
+
+        Returns:
+            Destination path
+        """
+        try:
+            os.rename(src, dst)
+            return dst
+        except OSError:
+            pass
+
+        pending = [(src, dst)]
+        while pending:
+            source, target = pending.pop()
+            os.makedirs(target, exist_ok=True)
+            with os.scandir(source) as it:
+                for entry in it:
+                    dest = os.path.join(target, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, dest))
+                    else:
+                        self.move_file(entry.path, dest)
+        return dst
+
+    def get_zip_path(self, notebook_id: int) -> str:
+        """
+        Get path of a notebook's reproducibility package ZIP.
+
+        Args:
+            notebook_id: ID of the notebook
+
+        Returns:
+            Path to the ZIP file (which may not exist yet)
+        """
+        return os.path.join(
+            self.base_dir, str(notebook_id), "reproducibility_package.zip"
+        )
+
+    def create_zip_async(self, notebook_id: int) -> Future:
+        """
+        Queue ``create_zip`` on the background ZIP pool.
+
+        A job queued while an earlier one for the same notebook is running
+        waits for it first, so the newest package is always written last.
+
+        Args:
+            notebook_id: ID of the notebook to package
+
+        Returns:
+            Future resolving to the ZIP path, or None if creation failed
+        """
+        with _zip_jobs_lock:
+            previous = _zip_jobs.get(notebook_id)
+            future = _zip_pool.submit(self._create_zip_after, previous, notebook_id)
+            _zip_jobs[notebook_id] = future
+
+        def _forget(done: Future):
+            with _zip_jobs_lock:
+                if _zip_jobs.get(notebook_id) is done:
+                    del _zip_jobs[notebook_id]
+
+        future.add_done_callback(_forget)
+        return future
+
+    def _create_zip_after(
+        self, previous: Optional[Future], notebook_id: int
+    ) -> Optional[str]:
+        if previous is not None:
+            previous.exception()  # Wait; its outcome does not matter
+        return self.create_zip(notebook_id)
+
+    def wait_for_zip(
+        self, notebook_id: int, timeout: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Wait for a queued ZIP build, if any, and return the package path.
+
+        Args:
+            notebook_id: ID of the notebook
+            timeout: Seconds to wait for a pending build (None waits forever)
+
+        Returns:
+            Path to the ZIP file, or None if it doesn't exist or is still
+            being built when the timeout expires
+        """
+        with _zip_jobs_lock:
+            future = _zip_jobs.get(notebook_id)
+        if future is not None:
+            try:
+                future.exception(timeout=timeout)
+            except FutureTimeoutError:
+                return None
+        zip_path = self.get_zip_path(notebook_id)
+        return zip_path if os.path.exists(zip_path) else None
+
+    def zip_state(self, notebook_id: int) -> str:
+        """
+        Report the state of a notebook's package ZIP without waiting.
+
+        Args:
+            notebook_id: ID of the notebook
+
+        Returns:
+            "building" while a build is queued or running, "failed" if the
+            last build raised, "ready" if the ZIP exists, otherwise "missing"
+        """
+        with _zip_jobs_lock:
+            future = _zip_jobs.get(notebook_id)
+        if future is not None and not future.done():
+            return "building"
+        notebook_dir = os.path.dirname(self.get_zip_path(notebook_id))
+        if os.path.exists(os.path.join(notebook_dir, _ZIP_ERROR_FILE)):
+            return "failed"
+        if os.path.exists(self.get_zip_path(notebook_id)):
+            return "ready"
+        return "missing"
+
+    def zip_error(self, notebook_id: int) -> str:
+        """
+        Get the error recorded by the last failed ZIP build.
+
+        Args:
+            notebook_id: ID of the notebook
+
+        Returns:
+            Error message, or empty string if the last build did not fail
+        """
+        notebook_dir = os.path.dirname(self.get_zip_path(notebook_id))
+        return self.read_marker(notebook_dir, _ZIP_ERROR_FILE)
+
+    def zip_ready(self, notebook_id: int) -> bool:
+        """
+        Check whether a package ZIP exists and no newer one is being built.
+
+        Args:
+            notebook_id: ID of the notebook
+
+        Returns:
+            True if the package can be downloaded right away
+        """
+        return self.zip_state(notebook_id) == "ready"
+
     def create_zip(self, notebook_id: int) -> Optional[str]:
         """
         Create ZIP archive of reproducibility package for download.
-        Excludes temporary files and other ZIPs.
+        Excludes temporary files and other ZIPs. Text artifacts are deflated at
+        the fastest level; archives and images are stored uncompressed. The
+        archive is written under a temporary name and renamed into place, so
+        a partly written package is never served.
 
         Args:
             notebook_id: ID of the notebook to package
 
         Returns:
-            Path to created ZIP file, or None if creation failed
+            Path to created ZIP file, or None if creation failed (the error is
+            recorded for ``zip_error``)
         """
         repro_dir = self.get_notebook_dir(notebook_id, "reproducibility")
-        zip_path = os.path.join(
-            self.base_dir, str(notebook_id), "reproducibility_package.zip"
-        )
+        zip_path = self.get_zip_path(notebook_id)
+        error_path = os.path.join(os.path.dirname(zip_path), _ZIP_ERROR_FILE)
 
         if not os.path.exists(repro_dir):
             return None
 
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(zip_path), prefix=".", suffix=".zip.part"
+        )
         try:
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(repro_dir):
-                    for file in files:
-                        # Exclude ZIP files, hidden files, and diff HTML
-                        if (
-                            file.endswith(".zip")
-                            or file.startswith(".")
-                            or file == "semantic_diff.html"
-                        ):
-                            continue
-
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, repro_dir)
-                        zipf.write(file_path, arcname)
+            with os.fdopen(fd, "wb") as f, zipfile.ZipFile(
+                f, "w", zipfile.ZIP_DEFLATED, compresslevel=1
+            ) as zipf:
+                # scandir stack: file types come from the directory listing
+                pending = [repro_dir]
+                while pending:
+                    with os.scandir(pending.pop()) as it:
+                        for entry in it:
+                            if entry.is_dir():
+                                # Like os.walk, symlinked dirs are not followed
+                                if not entry.is_symlink():
+                                    pending.append(entry.path)
+                                continue
+
+                            # Exclude ZIP files, hidden files, and diff HTML
+                            name = entry.name
+                            if (
+                                name.endswith(".zip")
+                                or name.startswith(".")
+                                or name == "semantic_diff.html"
+                            ):
+                                continue
+
+                            arcname = os.path.relpath(entry.path, repro_dir)
+                            ext = os.path.splitext(name)[1].lower()
+                            if ext in _ZIP_STORED_EXTENSIONS:
+                                zipf.write(entry.path, arcname, zipfile.ZIP_STORED)
+                            else:
+                                zipf.write(entry.path, arcname)
 
+            os.chmod(tmp_path, 0o644)  # mkstemp creates files owner-only
+            os.replace(tmp_path, zip_path)
+            try:
+                os.unlink(error_path)
+            except FileNotFoundError:
+                pass
             return zip_path
         except Exception as e:
-            print(f"Zip creation failed: {e}")
+            logger.warning("Zip creation failed: %s", e)
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            try:
+                self.replace_file(
+                    os.path.dirname(zip_path), _ZIP_ERROR_FILE, str(e) or repr(e)
+                )
+            except OSError as write_error:
+                logger.warning("Could not record zip failure: %s", write_error)
             return None
 
     def find_html_file(self, directory: str) -> Optional[str]:
         """
         Find first HTML file in directory tree.
 
+        Uses os.scandir so file types come from the directory listing itself,
+        and stops at the first match. Search order matches a top-down os.walk:
+        files in a directory before its subdirectories; symlinked directories
+        are not followed.
+
         Args:
             directory: Directory to search
 
         Returns:
             Path to HTML file, or None if not found
         """
-        if not os.path.exists(directory):
+        try:
+            it = os.scandir(directory)
+        except OSError:
             return None
 
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if file.endswith(".html"):
-                    return os.path.join(root, file)
+        subdirs = []
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".html"):
+                    return entry.path
+
+        for subdir in subdirs:
+            found = self.find_html_file(subdir)
+            if found:
+                return found
 
         return None
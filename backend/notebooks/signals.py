@@ -0,0 +1,33 @@
+"""
+Signal handlers keeping denormalized notebook counters in sync.
+"""
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Execution, Notebook
+
+
+@receiver(post_save, sender=Execution)
+def count_new_execution(sender, instance, created, **kwargs):
+    """
+    Increment the notebook's execution counter when an execution is created.
+
+    Uses F() expressions so concurrent executions can't lose updates.
+    """
+    if not created:
+        return
+    Notebook.objects.filter(pk=instance.notebook_id).update(
+        execution_count=F("execution_count") + 1,
+        last_executed_at=instance.started_at,
+    )
+
+
+@receiver(post_delete, sender=Execution)
+def uncount_deleted_execution(sender, instance, **kwargs):
+    """Decrement the notebook's execution counter, never below zero."""
+    Notebook.objects.filter(pk=instance.notebook_id).update(
+        execution_count=Greatest(F("execution_count") - 1, Value(0))
+    )
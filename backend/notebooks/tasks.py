@@ -0,0 +1,115 @@
+"""
+Background execution of long-running notebook jobs.
+Runs reproducibility package generation off the request thread.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .executors import R4RExecutor
+from .models import Execution, Notebook, ReproducibilityAnalysis
+
+logger = logging.getLogger("notebooks.tasks")
+
+# Bounded so concurrent r4r traces cannot exhaust the host
+_task_pool = ThreadPoolExecutor(
+    max_workers=getattr(settings, "NOTEBOOK_TASK_WORKERS", 2),
+    thread_name_prefix="notebook-task",
+)
+
+
+def save_package_result(notebook: Notebook, result: Dict[str, Any]):
+    """
+    Persist Dockerfile, Makefile, and dependencies from an R4R result.
+
+    Args:
+        notebook: Notebook the package was generated for
+        result: Successful R4RExecutor.execute() result
+    """
+    ReproducibilityAnalysis.objects.update_or_create(
+        notebook=notebook,
+        defaults={
+            "dockerfile": result.get("dockerfile", ""),
+            "makefile": result.get("makefile", ""),
+            "system_deps": result.get("manifest", {}).get("system_packages", []),
+            "r4r_data": result.get("r4r_data", {}),
+        },
+    )
+
+
+def _update_execution(execution_id: Optional[int], status: str, error: str = ""):
+    """Move a queued package job's Execution record to a new status."""
+    if execution_id is None:
+        return
+    execution = Execution.objects.filter(pk=execution_id).first()
+    if execution is None:
+        return
+    execution.status = status
+    update_fields = ["status"]
+    if status in ("completed", "failed"):
+        execution.error_message = error
+        execution.completed_at = timezone.now()
+        update_fields += ["error_message", "completed_at"]
+    execution.save(update_fields=update_fields)
+
+
+def run_r4r_task(
+    notebook_id: int, execution_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Generate and persist a reproducibility package on a worker thread.
+
+    Args:
+        notebook_id: ID of the notebook to package
+        execution_id: Pending Execution that tracks this job, if any
+
+    Returns:
+        R4RExecutor result dictionary
+    """
+    close_old_connections()
+    try:
+        _update_execution(execution_id, "running")
+        notebook = Notebook.objects.get(pk=notebook_id)
+        result = R4RExecutor().execute(notebook.id)
+        if result.get("success"):
+            save_package_result(notebook, result)
+            _update_execution(execution_id, "completed")
+        else:
+            logger.warning(
+                "Package generation failed for notebook %s: %s",
+                notebook_id,
+                result.get("error"),
+            )
+            _update_execution(
+                execution_id, "failed", result.get("error") or "Unknown error"
+            )
+        return result
+    except Exception as e:
+        logger.exception("Package generation crashed for notebook %s", notebook_id)
+        try:
+            _update_execution(execution_id, "failed", str(e))
+        except Exception:
+            logger.exception("Could not record failure for execution %s", execution_id)
+        raise
+    finally:
+        # Worker threads own their DB connections; don't leak them
+        close_old_connections()
+
+
+def enqueue_r4r(notebook_id: int, execution_id: Optional[int] = None) -> Future:
+    """
+    Queue package generation for a notebook.
+
+    Args:
+        notebook_id: ID of the notebook to package
+        execution_id: Pending Execution updated as the job progresses
+
+    Returns:
+        Future resolving to the R4RExecutor result
+    """
+    return _task_pool.submit(run_r4r_task, notebook_id, execution_id)
@@ -13,7 +13,7 @@ from django.contrib.auth.models import User
 from django.http import HttpResponse, FileResponse
 from django.utils import timezone
 from django.db.models import Q
-import os
+import logging
 import traceback
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -23,11 +23,17 @@ from django.contrib.auth import authenticate
 from .models import Notebook, Execution, ReproducibilityAnalysis
 from .serializers import (
     NotebookSerializer,
+    NotebookListSerializer,
     UserSerializer,
     ExecutionSerializer,
     ReproducibilityAnalysisSerializer,
+    ReproducibilityAnalysisListSerializer,
 )
 from .executors import RmdExecutor, R4RExecutor, RDiffExecutor
+from .services.storage_manager import StorageManager
+from .tasks import enqueue_r4r, save_package_result
+
+logger = logging.getLogger(__name__)
 
 
 class UserRegisterView(APIView):
@@ -68,14 +74,10 @@ class UserLoginView(APIView):
         username = request.data.get("username")
         password = request.data.get("password")
 
-        # DEBUG LOGGING
-
-        # Check if user exists
-        try:
-            db_user = User.objects.get(username=username)
-
-        except User.DoesNotExist:
-            print(f"User '{username}' does NOT exist in database")
+        # Extra lookup only when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            if not User.objects.filter(username=username).exists():
+                logger.debug("User '%s' does NOT exist in database", username)
 
         if not username or not password:
             return Response(
@@ -146,7 +148,7 @@ class UserProfileView(APIView):
         user.first_name = request.data.get("first_name", user.first_name)
         user.last_name = request.data.get("last_name", user.last_name)
         user.email = request.data.get("email", user.email)
-        user.save()
+        user.save(update_fields=["first_name", "last_name", "email"])
         return Response(
             {
                 "username": user.username,
@@ -163,6 +165,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    ordering = ("-date_joined",)
 
     def get_permissions(self):
         # Public registration, authenticated for other actions
@@ -198,7 +201,7 @@ class IsOwnerOrReadOnlyIfPublic(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS and obj.is_public:
             return True
         # Only owner can modify
-        return obj.author == request.user
+        return obj.author_id == request.user.id
 
 
 class NotebookViewSet(viewsets.ModelViewSet):
@@ -206,6 +209,13 @@ class NotebookViewSet(viewsets.ModelViewSet):
 
     serializer_class = NotebookSerializer
     queryset = Notebook.objects.all()
+    ordering = ("-updated_at",)
+
+    def get_serializer_class(self):
+        # Listings skip the notebook content and nested analysis
+        if self.action == "list":
+            return NotebookListSerializer
+        return NotebookSerializer
 
     def get_permissions(self):
         # Public read access, authenticated write access
@@ -216,8 +226,8 @@ class NotebookViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Get notebooks owned by current user OR that are public."""
         # Eager load related data to prevent N+1 queries
-        base_qs = Notebook.objects.select_related("author").prefetch_related(
-            "executions", "analysis"
+        base_qs = self.get_serializer_class().setup_eager_loading(
+            Notebook.objects.all()
         )
 
         user = self.request.user
@@ -243,7 +253,7 @@ class NotebookViewSet(viewsets.ModelViewSet):
                     {"error": "Authentication required"},
                     status=status.HTTP_401_UNAUTHORIZED,
                 )
-            if notebook.author != request.user:
+            if notebook.author_id != request.user.id:
                 return Response(
                     {"error": "This notebook is private"},
                     status=status.HTTP_403_FORBIDDEN,
@@ -261,7 +271,7 @@ class NotebookViewSet(viewsets.ModelViewSet):
         # Execute R Markdown notebook and save results
         notebook = self.get_object()
 
-        if notebook.author != request.user:
+        if notebook.author_id != request.user.id:
             return Response(
                 {"error": "Only the owner can execute this notebook"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -279,7 +289,9 @@ class NotebookViewSet(viewsets.ModelViewSet):
                 execution.html_output = result.get("html", "")
                 execution.status = "completed"
                 execution.completed_at = timezone.now()
-                execution.save()
+                execution.save(
+                    update_fields=["html_output", "status", "completed_at"]
+                )
 
                 # Save static analysis results
                 ReproducibilityAnalysis.objects.update_or_create(
@@ -296,7 +308,9 @@ class NotebookViewSet(viewsets.ModelViewSet):
                 execution.status = "failed"
                 execution.error_message = result.get("error", "Unknown error")
                 execution.completed_at = timezone.now()
-                execution.save()
+                execution.save(
+                    update_fields=["status", "error_message", "completed_at"]
+                )
                 return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
@@ -305,7 +319,7 @@ class NotebookViewSet(viewsets.ModelViewSet):
             execution.status = "failed"
             execution.error_message = str(e)
             execution.completed_at = timezone.now()
-            execution.save()
+            execution.save(update_fields=["status", "error_message", "completed_at"])
             return Response(
                 {"success": False, "error": f"Server Error: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -316,12 +330,26 @@ class NotebookViewSet(viewsets.ModelViewSet):
         # Generate reproducibility package using r4r
         notebook = self.get_object()
 
-        if notebook.author != request.user:
+        if notebook.author_id != request.user.id:
             return Response(
                 {"error": "Only the owner can generate a package"},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
+        # Opt-in background mode: return immediately; the job's progress and
+        # any failure are recorded on the returned execution
+        if request.query_params.get("async") in ("1", "true"):
+            execution = Execution.objects.create(notebook=notebook, status="pending")
+            enqueue_r4r(notebook.id, execution.id)
+            return Response(
+                {
+                    "status": "accepted",
+                    "notebook_id": notebook.id,
+                    "execution_id": execution.id,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
         try:
             # Run r4r to trace dependencies
             executor = R4RExecutor()
@@ -329,17 +357,7 @@ class NotebookViewSet(viewsets.ModelViewSet):
 
             if result.get("success"):
                 # Save Dockerfile, Makefile, and dependencies
-                ReproducibilityAnalysis.objects.update_or_create(
-                    notebook=notebook,
-                    defaults={
-                        "dockerfile": result.get("dockerfile", ""),
-                        "makefile": result.get("makefile", ""),
-                        "system_deps": result.get("manifest", {}).get(
-                            "system_packages", []
-                        ),
-                        "r4r_data": result.get("r4r_data", {}),
-                    },
-                )
+                save_package_result(notebook, result)
 
             return Response(result)
 
@@ -355,7 +373,7 @@ class NotebookViewSet(viewsets.ModelViewSet):
         # Generate rdiff comparison visualization
         notebook = self.get_object()
 
-        if notebook.author != request.user:
+        if notebook.author_id != request.user.id:
             return Response(
                 {"error": "Only the owner can generate diff"},
                 status=status.HTTP_403_FORBIDDEN,
@@ -391,7 +409,10 @@ class NotebookViewSet(viewsets.ModelViewSet):
         notebook = self.get_object()
 
         if not notebook.is_public:
-            if not request.user.is_authenticated or notebook.author != request.user:
+            if (
+                not request.user.is_authenticated
+                or notebook.author_id != request.user.id
+            ):
                 return Response(
                     {"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN
                 )
@@ -406,14 +427,34 @@ class NotebookViewSet(viewsets.ModelViewSet):
         notebook = self.get_object()
 
         if not notebook.is_public:
-            if not request.user.is_authenticated or notebook.author != request.user:
+            if (
+                not request.user.is_authenticated
+                or notebook.author_id != request.user.id
+            ):
                 return Response(
                     {"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN
                 )
 
         try:
-            zip_path = f"storage/notebooks/{notebook.id}/reproducibility_package.zip"
-            if not os.path.exists(zip_path):
+            # The ZIP is built in the background after package generation;
+            # report its state instead of holding the request open
+            storage_manager = StorageManager()
+            zip_state = storage_manager.zip_state(notebook.id)
+            if zip_state == "building":
+                return Response(
+                    {"package_ready": False, "state": zip_state},
+                    status=status.HTTP_202_ACCEPTED,
+                )
+            if zip_state == "failed":
+                return Response(
+                    {
+                        "package_ready": False,
+                        "state": zip_state,
+                        "error": storage_manager.zip_error(notebook.id),
+                    },
+                    status=status.HTTP_409_CONFLICT,
+                )
+            if zip_state == "missing":
                 return Response(
                     {
                         "error": "Package not generated yet. Run 'Generate Package' first."
@@ -422,13 +463,34 @@ class NotebookViewSet(viewsets.ModelViewSet):
                 )
 
             return FileResponse(
-                open(zip_path, "rb"),
+                open(storage_manager.get_zip_path(notebook.id), "rb"),
                 as_attachment=True,
                 filename=f"notebook_{notebook.id}_package.zip",
             )
         except Exception as e:
             return Response({"error": str(e)}, status=400)
 
+    @action(detail=True, methods=["get"])
+    def package_status(self, request, pk=None):
+        # Whether the reproducibility package ZIP can be downloaded yet
+        notebook = self.get_object()
+
+        if not notebook.is_public:
+            if (
+                not request.user.is_authenticated
+                or notebook.author_id != request.user.id
+            ):
+                return Response(
+                    {"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN
+                )
+
+        storage_manager = StorageManager()
+        zip_state = storage_manager.zip_state(notebook.id)
+        data = {"package_ready": zip_state == "ready", "state": zip_state}
+        if zip_state == "failed":
+            data["error"] = storage_manager.zip_error(notebook.id)
+        return Response(data)
+
     @action(detail=True, methods=["get"])
     @method_permission_classes([AllowAny])
     def executions(self, request, pk=None):
@@ -440,7 +502,9 @@ class NotebookViewSet(viewsets.ModelViewSet):
                 {"error": "Notebook not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        is_owner = request.user.is_authenticated and notebook.author == request.user
+        is_owner = (
+            request.user.is_authenticated and notebook.author_id == request.user.id
+        )
         if not notebook.is_public and not is_owner:
             if not request.user.is_authenticated:
                 return Response(
@@ -452,9 +516,9 @@ class NotebookViewSet(viewsets.ModelViewSet):
             )
 
         # Fetch execution history with notebook data
-        executions = (
-            notebook.executions.all().select_related("notebook").order_by("-started_at")
-        )
+        executions = ExecutionSerializer.setup_eager_loading(
+            notebook.executions.all()
+        ).order_by("-started_at")
 
         serializer = ExecutionSerializer(executions, many=True)
         return Response(serializer.data)
@@ -464,13 +528,15 @@ class NotebookViewSet(viewsets.ModelViewSet):
     def reproducibility(self, request, pk=None):
         # Get reproducibility analysis data
         try:
-            notebook = Notebook.objects.get(pk=pk)
+            notebook = Notebook.objects.with_related(executions=False).get(pk=pk)
         except Notebook.DoesNotExist:
             return Response(
                 {"error": "Notebook not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        is_owner = request.user.is_authenticated and notebook.author == request.user
+        is_owner = (
+            request.user.is_authenticated and notebook.author_id == request.user.id
+        )
         if not notebook.is_public and not is_owner:
             if not request.user.is_authenticated:
                 return Response(
@@ -495,14 +561,14 @@ class NotebookViewSet(viewsets.ModelViewSet):
     def toggle_public(self, request, pk=None):
         # Toggle notebook public/private visibility
         notebook = self.get_object()
-        if notebook.author != request.user:
+        if notebook.author_id != request.user.id:
             return Response(
                 {"error": "Only the owner can change public status"},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
         notebook.is_public = not notebook.is_public
-        notebook.save()
+        notebook.save(update_fields=["is_public", "updated_at"])
         return Response(
             {
                 "is_public": notebook.is_public,
@@ -516,13 +582,15 @@ class ExecutionViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = ExecutionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = ("-started_at",)
 
     def get_queryset(self):
         """Get executions for current user's notebooks."""
         # Fetch execution records with related notebook data
         return (
-            Execution.objects.filter(notebook__author=self.request.user)
-            .select_related("notebook", "notebook__author")
+            self.get_serializer_class()
+            .setup_eager_loading(Execution.objects.all())
+            .filter(notebook__author=self.request.user)
             .order_by("-started_at")
         )
 
@@ -532,9 +600,18 @@ class ReproducibilityAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = ReproducibilityAnalysisSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = ("-created_at",)
+
+    def get_serializer_class(self):
+        # Lists skip the generated files; fetch a single analysis for them
+        if self.action == "list":
+            return ReproducibilityAnalysisListSerializer
+        return ReproducibilityAnalysisSerializer
 
     def get_queryset(self):
         # Get analyses for current user's notebooks
-        return ReproducibilityAnalysis.objects.filter(
-            notebook__author=self.request.user
+        return (
+            self.get_serializer_class()
+            .setup_eager_loading(ReproducibilityAnalysis.objects.all())
+            .filter(notebook__author=self.request.user)
         )
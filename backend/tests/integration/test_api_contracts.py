@@ -7,11 +7,16 @@ permission models for reproducibility features[web:32][web:38].
 tests/integration/test_api_contracts.py
 """
 
+import os
+import shutil
+from unittest.mock import patch
+
 from django.test import TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 from rest_framework import status
 from notebooks.models import Notebook, Execution
+from notebooks.services.storage_manager import StorageManager
 
 
 class APIContractTest(TestCase):
@@ -31,6 +36,16 @@ class APIContractTest(TestCase):
             is_public=False,
         )
 
+    def test_api_root_lists_endpoints(self):
+        """Verify the API index lists routes and requires authentication."""
+        response = self.client.get("/api/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["notebooks"], "/api/notebooks/")
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get("/api/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_notebook_detail_structure(self):
         """Verify notebook detail endpoint returns exact keys from NotebookSerializer."""
         response = self.client.get(f"/api/notebooks/{self.notebook.id}/")
@@ -315,6 +330,41 @@ class DownloadPackageIntegrationTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertIn("error", response.data)
 
+    def test_package_status_before_generation(self):
+        """Package status reports no package before generation."""
+        response = self.client.get(
+            f"/api/notebooks/{self.notebook.id}/package_status/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["package_ready"])
+
+    def test_failed_package_build_is_reported(self):
+        """A failed ZIP build is reported instead of looking not generated."""
+        storage = StorageManager()
+        self.addCleanup(
+            shutil.rmtree,
+            os.path.dirname(storage.get_zip_path(self.notebook.id)),
+            ignore_errors=True,
+        )
+        with patch(
+            "notebooks.services.storage_manager.zipfile.ZipFile",
+            side_effect=OSError("disk full"),
+        ):
+            self.assertIsNone(storage.create_zip(self.notebook.id))
+
+        response = self.client.get(
+            f"/api/notebooks/{self.notebook.id}/package_status/"
+        )
+        self.assertFalse(response.data["package_ready"])
+        self.assertEqual(response.data["state"], "failed")
+        self.assertIn("disk full", response.data["error"])
+
+        response = self.client.get(
+            f"/api/notebooks/{self.notebook.id}/download_package/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(response.data["package_ready"])
+
     def test_download_package_requires_authentication(self):
         """Package download requires authentication even for public notebooks."""
         self.notebook.is_public = True
@@ -4,13 +4,20 @@ tests/unit/test_executors.py
 """
 
 from django.test import TestCase
-from notebooks.executors.rmd_executor import RmdExecutor
-from notebooks.executors.r4r_executor import R4RExecutor
+from notebooks.executors.rmd_executor import RmdExecutor, _splice_prose
+from notebooks.executors.r4r_executor import R4RExecutor, _parse_apt_libs
 from notebooks.executors.rdiff_executor import RDiffExecutor
+from notebooks.executors.r_worker import RWorker, _split_done
 from notebooks.models import Notebook
 from django.contrib.auth.models import User
+import json
 import os
 import shutil
+import subprocess
+import tempfile
+import zipfile
+from unittest import skipUnless
+from unittest.mock import patch
 
 
 class RmdExecutorTest(TestCase):
@@ -192,6 +199,111 @@ class R4RExecutorTest(TestCase):
         self.assertIn("error", result)
         self.assertIn("Run notebook first", result["error"])
 
+    def test_execute_reuses_cached_result_for_unchanged_notebook(self):
+        """Test an unchanged notebook returns the stored package without r4r"""
+        from notebooks.executors.r4r_executor import _compute_content_hash
+
+        storage = self.executor.storage_manager
+        final_dir = storage.get_notebook_dir(self.notebook.id)
+        storage.write_file(final_dir, "notebook.Rmd", self.notebook.content)
+        content_hash = _compute_content_hash(self.notebook.content.encode())
+        storage.write_file(final_dir, ".content_hash", content_hash)
+        storage.write_file(
+            final_dir,
+            ".r4r_result.json",
+            json.dumps(
+                {
+                    "success": True,
+                    "dockerfile": "FROM rocker/r-ver:4.3.0",
+                    "content_hash": content_hash,
+                }
+            ),
+        )
+        self.executor.r4r_binary = None
+
+        result = self.executor.execute(self.notebook.id)
+
+        self.assertTrue(result["success"])
+        self.assertTrue(result["cached"])
+        self.assertEqual(result["dockerfile"], "FROM rocker/r-ver:4.3.0")
+        # The stat stamp is recorded so the next call skips hashing
+        marker = storage.read_marker(final_dir, ".content_hash").split("\n")
+        self.assertEqual(marker[0], content_hash)
+        self.assertEqual(len(marker), 2)
+
+    def test_prose_edit_refreshes_package(self):
+        """Test a prose-only edit repackages the new source and container render"""
+        traces = []
+
+        def fake_r4r(cmd, cwd, **kwargs):
+            if "--output" not in cmd:
+                # Prose-only re-render: "converts" the spliced markdown
+                with open(os.path.join(cwd, "notebook.md")) as f:
+                    knit_md = f.read()
+                with open(os.path.join(cwd, "notebook.html"), "w") as f:
+                    f.write(f"<pre>{knit_md}</pre>")
+                return subprocess.CompletedProcess(cmd, 0, "", "")
+
+            # Stand-in for the trace: "knits" and renders notebook.Rmd verbatim
+            traces.append(cmd)
+            output_dir = cmd[cmd.index("--output") + 1]
+            os.makedirs(output_dir)
+            with open(os.path.join(cwd, "notebook.Rmd")) as f:
+                source = f.read()
+            with open(os.path.join(cwd, "notebook.knit.md"), "w") as f:
+                f.write(source)
+            with open(os.path.join(output_dir, "notebook.html"), "w") as f:
+                f.write(f"<pre>{source}</pre>")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        storage = self.executor.storage_manager
+        final_dir = storage.get_notebook_dir(self.notebook.id)
+        self.executor.r4r_binary = "/usr/local/bin/r4r"
+
+        original = self.notebook.content + "\nThe end.\n"
+        packages = []
+        with patch.object(self.executor, "_run_command", side_effect=fake_r4r):
+            for content in (original, original.replace("The end.", "More. The end.")):
+                storage.replace_file(final_dir, "notebook.Rmd", content)
+                self.assertTrue(self.executor.execute(self.notebook.id)["success"])
+                zip_path = storage.wait_for_zip(self.notebook.id, timeout=30)
+                with zipfile.ZipFile(zip_path) as zf:
+                    packages.append(
+                        (zf.read("notebook.Rmd"), zf.read("notebook_container.html"))
+                    )
+
+        # The prose edit was re-rendered without tracing again
+        self.assertEqual(len(traces), 1)
+        self.assertNotIn(b"More.", packages[0][0])
+        self.assertIn(b"More.", packages[1][0])
+        self.assertNotIn(b"More.", packages[0][1])
+        self.assertIn(b"More.", packages[1][1])
+
+    def test_code_edit_runs_full_trace(self):
+        """Test a code edit is traced again instead of re-rendered"""
+        traces = []
+
+        def fake_r4r(cmd, cwd, **kwargs):
+            traces.append(cmd)
+            os.makedirs(cmd[cmd.index("--output") + 1])
+            with open(os.path.join(cwd, "notebook.knit.md"), "w") as f:
+                f.write("knitted")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        storage = self.executor.storage_manager
+        final_dir = storage.get_notebook_dir(self.notebook.id)
+        self.executor.r4r_binary = "/usr/local/bin/r4r"
+
+        with patch.object(self.executor, "_run_command", side_effect=fake_r4r):
+            for content in (
+                self.notebook.content,
+                self.notebook.content.replace("print('test')", "print('edited')"),
+            ):
+                storage.replace_file(final_dir, "notebook.Rmd", content)
+                self.assertTrue(self.executor.execute(self.notebook.id)["success"])
+
+        self.assertEqual(len(traces), 2)
+
     def test_execute_generates_dockerfile(self):
         """Test that execution generates Dockerfile"""
         result = self.executor.execute(self.notebook.id)
@@ -272,6 +384,109 @@ class R4RExecutorTest(TestCase):
             shutil.rmtree(storage_path)
 
 
+class R4RMetricsParsingTest(TestCase):
+    """Test parsing of r4r output artifacts"""
+
+    def test_parse_apt_libs(self):
+        """Test system libraries are extracted from apt-get install lines"""
+        dockerfile = (
+            "FROM rocker/r-ver:4.3\n"
+            "RUN apt-get update -y && apt-get install -y --no-install-recommends \\\n"
+            "    libxml2:amd64 \\\n"
+            "    pandoc=2.0 && rm -rf /var/lib/apt/lists/*\n"
+            "RUN apt-get install -y libssl-dev; echo done\n"
+        )
+
+        libs = _parse_apt_libs(dockerfile)
+
+        self.assertEqual(libs, {"libxml2", "pandoc", "libssl-dev"})
+
+    def test_parse_apt_libs_requires_yes_flag(self):
+        """Test install commands without -y are ignored"""
+        self.assertEqual(_parse_apt_libs("RUN apt-get install libfoo\n"), set())
+
+    def test_parse_apt_libs_yes_flag_ends_line(self):
+        """Test packages on the line after a trailing -y are picked up"""
+        dockerfile = "RUN apt-get install -y\n\n  libcurl4 libgit2 && echo ok\n"
+        self.assertEqual(_parse_apt_libs(dockerfile), {"libcurl4", "libgit2"})
+
+
+class ProseSpliceTest(TestCase):
+    """Test reuse of knitted markdown after prose-only edits"""
+
+    OLD = "Intro.\n\n```{r}\nprint(1)\n```\n\nMiddle.\n\n```{r}\nplot(1)\n```\n"
+    KNIT = (
+        "Intro.\n\n```r\nprint(1)\n```\n\n```\n## [1] 1\n```\n\nMiddle.\n\n"
+        "![](notebook_files/figure-html/unnamed-chunk-2-1.png)\n"
+    )
+
+    def test_splice_replaces_edited_prose(self):
+        """Test edited prose is swapped in and chunk output kept"""
+        new = self.OLD.replace("Middle.", "Middle, reworded.")
+
+        knit_md = _splice_prose(self.OLD, new, self.KNIT)
+
+        self.assertEqual(knit_md, self.KNIT.replace("Middle.", "Middle, reworded."))
+
+    def test_splice_rejects_changed_chunks(self):
+        """Test a different number of chunks falls back to a full render"""
+        new = self.OLD + "\n```{r}\nprint(2)\n```\n"
+        self.assertIsNone(_splice_prose(self.OLD, new, self.KNIT))
+
+
+class RWorkerProtocolTest(TestCase):
+    """Test parsing of R worker completion markers"""
+
+    def test_split_done_waits_for_full_marker_line(self):
+        """Test output is only released once the status line is complete"""
+        self.assertIsNone(_split_done(b"rendering...\n__RWORKER_DO"))
+        self.assertIsNone(_split_done(b"rendering...\n__RWORKER_DONE__ 0"))
+
+        output, status, retire = _split_done(b"rendering...\n__RWORKER_DONE__ 1 \n")
+
+        self.assertEqual(output, b"rendering...")
+        self.assertEqual(status, 1)
+        self.assertFalse(retire)
+
+    def test_split_done_reads_retire_flag(self):
+        """Test a worker can ask to be retired after a job"""
+        _, status, retire = _split_done(b"__RWORKER_DONE__ 0 1 \n")
+
+        self.assertEqual(status, 0)
+        self.assertTrue(retire)
+
+    @skipUnless(shutil.which("R"), "R is not installed")
+    def test_job_state_does_not_leak_to_next_job(self):
+        """Test options, env vars, globals and RNG state are reset between jobs"""
+        worker = RWorker()
+        self.addCleanup(worker.close)
+        cwd = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cwd, ignore_errors=True)
+
+        first = worker.run(
+            "options(rw_leak = 42, digits = 3)\n"
+            "Sys.setenv(RW_LEAK = '1')\n"
+            "leaked <<- TRUE\n"
+            "set.seed(1)",
+            cwd,
+            timeout=60,
+            max_lines=100,
+        )
+        self.assertEqual(first.returncode, 0)
+        self.assertFalse(worker.retire)
+
+        second = worker.run(
+            "cat(paste(is.null(getOption('rw_leak')), getOption('digits'),"
+            " nzchar(Sys.getenv('RW_LEAK')), exists('leaked'),"
+            " exists('.Random.seed', envir = globalenv()), sep = ','))",
+            cwd,
+            timeout=60,
+            max_lines=100,
+        )
+        self.assertEqual(second.returncode, 0)
+        self.assertIn("TRUE,7,FALSE,FALSE,FALSE", second.stdout)
+
+
 class RDiffExecutorTest(TestCase):
     """Test RDiffExecutor functionality"""
 
@@ -8,6 +8,7 @@ from django.contrib.auth.models import User
 from notebooks.models import Notebook, Execution, ReproducibilityAnalysis
 from datetime import datetime
 from django.utils import timezone
+from unittest.mock import patch
 
 
 class NotebookModelTest(TestCase):
@@ -60,6 +61,76 @@ class NotebookModelTest(TestCase):
         self.notebook.save()
         self.assertTrue(self.notebook.is_public)
 
+    def test_content_sha256_tracks_content(self):
+        """Test content hash is set on create and refreshed on change"""
+        import hashlib
+
+        expected = hashlib.sha256(b"# Test\n``````").hexdigest()
+        self.assertEqual(self.notebook.content_sha256, expected)
+
+        self.notebook.content = "# Changed"
+        self.notebook.save(update_fields=["content"])
+        self.notebook.refresh_from_db()
+        self.assertEqual(
+            self.notebook.content_sha256, hashlib.sha256(b"# Changed").hexdigest()
+        )
+
+    def test_content_sha256_skipped_without_content(self):
+        """Test saves that leave content alone do not rehash it"""
+        with patch("notebooks.models.hashlib.sha256") as mock_sha256:
+            self.notebook.is_public = True
+            self.notebook.save(update_fields=["is_public"])
+
+        mock_sha256.assert_not_called()
+
+    def test_save_keeps_concurrent_execution_count(self):
+        """Test saving a stale instance does not revert the execution counter"""
+        stale = Notebook.objects.get(pk=self.notebook.pk)
+        Execution.objects.create(notebook=self.notebook, status="completed")
+
+        stale.title = "Edited"
+        stale.save()
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.title, "Edited")
+        self.assertEqual(stale.execution_count, 1)
+        self.assertIsNotNone(stale.last_executed_at)
+
+    def test_execution_count_follows_executions(self):
+        """Test execution counter and timestamp are kept in sync by signals"""
+        first = Execution.objects.create(notebook=self.notebook, status="completed")
+        Execution.objects.create(notebook=self.notebook, status="failed")
+        self.notebook.refresh_from_db()
+        self.assertEqual(self.notebook.execution_count, 2)
+        self.assertIsNotNone(self.notebook.last_executed_at)
+
+        first.delete()
+        self.notebook.refresh_from_db()
+        self.assertEqual(self.notebook.execution_count, 1)
+
+    def test_with_related_loads_relations_upfront(self):
+        """Test with_related avoids per-notebook queries for relations"""
+        Execution.objects.create(notebook=self.notebook, status="completed")
+        ReproducibilityAnalysis.objects.create(notebook=self.notebook)
+
+        with self.assertNumQueries(2):
+            notebooks = list(Notebook.objects.with_related())
+            for notebook in notebooks:
+                notebook.author.username
+                notebook.analysis.pk
+                list(notebook.executions.all())
+
+    def test_for_list_skips_content(self):
+        """Test for_list loads listing columns in one query without content"""
+        ReproducibilityAnalysis.objects.create(notebook=self.notebook)
+
+        with self.assertNumQueries(1):
+            notebook = Notebook.objects.for_list().get(pk=self.notebook.pk)
+            self.assertEqual(notebook.author.username, self.user.username)
+            self.assertTrue(hasattr(notebook, "analysis"))
+
+        self.assertIn("content", notebook.get_deferred_fields())
+
 
 class ExecutionModelTest(TestCase):
     """Test Execution model"""
@@ -7,7 +7,11 @@ tests/unit/test_serializers.py
 from unittest.mock import patch, MagicMock, mock_open
 from django.test import TestCase
 from notebooks.services.storage_manager import StorageManager
-from notebooks.services.package_manager import RPackageManager
+from notebooks.services import package_manager
+from notebooks.services.package_manager import RPackageManager, r_environment
+from notebooks.services.render_cache import RenderCache
+import os
+import tempfile
 
 
 class StorageManagerUnitTest(TestCase):
@@ -85,6 +89,19 @@ class RPackageManagerUnitTest(TestCase):
         mock_run.assert_called_once()
         self.assertIn("ggplot2", mock_run.call_args[0][0][2])
 
+    def test_build_install_script_does_not_attach(self):
+        """Test install script only loads namespaces inside local()"""
+        script = self.manager.build_install_script(["ggplot2"])
+        self.assertIn("'ggplot2'", script)
+        self.assertTrue(script.strip().startswith("local({"))
+        self.assertNotIn("require(", script)
+
+    @patch.object(package_manager, "r_lib_dir", return_value="/cache/rlib")
+    def test_r_environment_prepends_lib_dir(self, _mock_lib_dir):
+        """Test r_environment puts the shared library first"""
+        env = r_environment({"R_LIBS_USER": "/home/r4r/R"})
+        self.assertEqual(env["R_LIBS_USER"], "/cache/rlib:/home/r4r/R")
+
 
 class StorageManagerErrorTest(TestCase):
     """Test error paths"""
@@ -99,3 +116,48 @@ class StorageManagerErrorTest(TestCase):
 
         content = self.storage.read_file("/fake", "missing.txt")
         self.assertEqual(content, "")
+
+
+class RenderCacheTest(TestCase):
+    """Test the content-addressed render cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = RenderCache(base_dir=self.tmp.name, max_entries=2)
+        self.html = os.path.join(self.tmp.name, ".notebook.html")
+        with open(self.html, "w") as f:
+            f.write("<html></html>")
+
+    def test_store_then_lookup(self):
+        """Stored renders are found by key"""
+        self.assertIsNone(self.cache.lookup("abc"))
+
+        self.cache.store("abc", {"notebook.html": self.html})
+
+        entry = self.cache.lookup("abc")
+        with open(os.path.join(entry, "notebook.html")) as f:
+            self.assertEqual(f.read(), "<html></html>")
+
+    def test_evicts_least_recently_used(self):
+        """Only max_entries renders are kept, oldest use first out"""
+        for key in ("a", "b"):
+            self.cache.store(key, {"notebook.html": self.html})
+        os.utime(os.path.join(self.tmp.name, "b"), (0, 0))
+
+        self.cache.store("c", {"notebook.html": self.html})
+
+        self.assertIsNone(self.cache.lookup("b"))
+        self.assertIsNotNone(self.cache.lookup("a"))
+        self.assertIsNotNone(self.cache.lookup("c"))
+
+    def test_replace_file_keeps_cached_copy(self):
+        """Replacing a published file leaves the cache entry's link intact"""
+        entry = self.cache.store("abc", {"notebook.html": self.html})
+
+        StorageManager().replace_file(self.tmp.name, ".notebook.html", "changed")
+
+        with open(os.path.join(entry, "notebook.html")) as f:
+            self.assertEqual(f.read(), "<html></html>")
+        with open(self.html) as f:
+            self.assertEqual(f.read(), "changed")
@@ -3,11 +3,13 @@ Unit tests for Django views.
 tests/unit/test_views.py
 """
 
+from unittest.mock import patch
 from django.test import TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APIRequestFactory, force_authenticate
 from rest_framework import status
 from notebooks.models import Notebook, Execution, ReproducibilityAnalysis
+from notebooks.tasks import run_r4r_task
 from notebooks.views import NotebookViewSet, UserViewSet
 
 
@@ -38,6 +40,21 @@ class NotebookViewSetTest(TestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["title"], "Test Notebook")
 
+    def test_list_paginates_only_on_request(self):
+        """Test list is a plain array unless page_size is given"""
+        Notebook.objects.create(title="Second", content="", author=self.user)
+        view = NotebookViewSet.as_view({"get": "list"})
+
+        request = self.factory.get("/api/notebooks/")
+        force_authenticate(request, user=self.user)
+        self.assertEqual(len(view(request).data), 2)
+
+        request = self.factory.get("/api/notebooks/", {"page_size": 1})
+        force_authenticate(request, user=self.user)
+        response = view(request)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+
     def test_perform_create_assigns_author(self):
         """Test that author is auto-assigned on create"""
         view = NotebookViewSet.as_view({"post": "create"})
@@ -182,6 +199,43 @@ class NotebookActionsTest(TestCase):
         self.assertEqual(response["Content-Type"], "text/plain")
         self.assertIn("attachment", response["Content-Disposition"])
 
+    @patch("notebooks.views.enqueue_r4r")
+    def test_generate_package_async_returns_accepted(self, mock_enqueue):
+        """Test async package generation is queued and returns 202"""
+        view = NotebookViewSet.as_view({"post": "generate_package"})
+        request = self.factory.post(
+            f"/api/notebooks/{self.notebook.id}/generate_package/?async=1"
+        )
+        force_authenticate(request, user=self.user)
+
+        response = view(request, pk=self.notebook.id)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        execution = Execution.objects.get(pk=response.data["execution_id"])
+        self.assertEqual(execution.status, "pending")
+        mock_enqueue.assert_called_once_with(self.notebook.id, execution.id)
+
+    # close_old_connections would drop the test transaction's connection
+    @patch("notebooks.tasks.close_old_connections")
+    @patch("notebooks.tasks.R4RExecutor")
+    def test_async_package_failure_is_recorded(self, mock_executor, _mock_close):
+        """Test a failed background package job marks its execution failed"""
+        mock_executor.return_value.execute.return_value = {
+            "success": False,
+            "error": "r4r binary not found",
+        }
+        execution = Execution.objects.create(notebook=self.notebook, status="pending")
+
+        run_r4r_task(self.notebook.id, execution.id)
+
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, "failed")
+        self.assertEqual(execution.error_message, "r4r binary not found")
+        self.assertIsNotNone(execution.completed_at)
+        self.assertFalse(
+            ReproducibilityAnalysis.objects.filter(notebook=self.notebook).exists()
+        )
+
     def test_reproducibility_action_no_analysis(self):
         """Test reproducibility endpoint with no analysis"""
         view = NotebookViewSet.as_view({"get": "reproducibility"})
@@ -9,6 +9,7 @@ import type {
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api'
 const API_TIMEOUT = 600000
+const PACKAGE_POLL_INTERVAL = 2000
 
 /**
  * API Service for communicating with Django backend
@@ -279,10 +280,24 @@ class ApiService {
    * @returns Promise that resolves when download is initiated
    */
   async downloadPackage(id: number | string): Promise<void> {
-    const response = await this.api.get(`/notebooks/${id}/download_package/`, {
+    let response = await this.api.get(`/notebooks/${id}/download_package/`, {
       responseType: 'blob',
     })
 
+    // 202: the ZIP is still being built, so poll until it is ready
+    while (response.status === 202) {
+      await new Promise((resolve) => setTimeout(resolve, PACKAGE_POLL_INTERVAL))
+      const statusResponse = await this.api.get(`/notebooks/${id}/package_status/`)
+      if (statusResponse.data.state === 'failed') {
+        throw new Error(statusResponse.data.error || 'Package build failed')
+      }
+      if (statusResponse.data.state !== 'building') {
+        response = await this.api.get(`/notebooks/${id}/download_package/`, {
+          responseType: 'blob',
+        })
+      }
+    }
+
     const url = window.URL.createObjectURL(new Blob([response.data]))
     const link = document.createElement('a')
     link.href = url